@@ -13,48 +13,139 @@ if BACKEND_DIR not in sys.path:
 # Try package-style first; fall back to shimmed path
 try:
     from backend.utils.llm_client import LLMClient
-    from backend.prompts.templates import SIMULATE_SYSTEM_PROMPT
+    from backend.utils.response_cache import ResponseCache
+    from backend.utils.resilience import LLMHTTPError, CircuitOpenError
+    from backend.utils.json_codec import CompressedJSON, codec, compress_legacy_rows
+    from backend.utils.fast_json import FastJSONResponse
+    from backend.utils.json_stream import RowStreamParser
+    from backend.utils.compression import (
+        CompressionMiddleware,
+        compress_body,
+        negotiate_encoding,
+    )
+    from backend.utils.metrics import REGISTRY, MetricsMiddleware, stat_gauges
+    from backend.utils.token_budget import TokenBudget
+    from backend.utils.logging_setup import (
+        RequestIdMiddleware,
+        configure_logging,
+        payload_sampled,
+    )
+    from backend.models.lifecycle import validate_sections
+    from backend.agents.pipeline import fast_pipeline, scenario_request
+    from backend.prompts.compiler import (
+        PROMPT_MAX_PAYLOAD_TOKENS,
+        PROMPT_VARIANT,
+        fit_payload,
+        prompts_for,
+    )
 except ModuleNotFoundError:
     from utils.llm_client import LLMClient
-    from prompts.templates import SIMULATE_SYSTEM_PROMPT
+    from utils.response_cache import ResponseCache
+    from utils.resilience import LLMHTTPError, CircuitOpenError
+    from utils.json_codec import CompressedJSON, codec, compress_legacy_rows
+    from utils.fast_json import FastJSONResponse
+    from utils.json_stream import RowStreamParser
+    from utils.compression import (
+        CompressionMiddleware,
+        compress_body,
+        negotiate_encoding,
+    )
+    from utils.metrics import REGISTRY, MetricsMiddleware, stat_gauges
+    from utils.token_budget import TokenBudget
+    from utils.logging_setup import (
+        RequestIdMiddleware,
+        configure_logging,
+        payload_sampled,
+    )
+    from models.lifecycle import validate_sections
+    from agents.pipeline import fast_pipeline, scenario_request
+    from prompts.compiler import (
+        PROMPT_MAX_PAYLOAD_TOKENS,
+        PROMPT_VARIANT,
+        fit_payload,
+        prompts_for,
+    )
 
 from typing import Optional, List, Dict, Any, Tuple
-import traceback
+import asyncio
+import base64
+import codecs
+import hashlib
+import json
+import logging
+import secrets
+import sqlite3
+import time
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
-from fastapi import FastAPI, Request, HTTPException, Depends, Path
+from fastapi import FastAPI, Request, Response, HTTPException, Depends, Path, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 import httpx
 
 # --- SQLModel / SQLite ---
 from sqlmodel import (
     SQLModel,
     Field as SQLField,
-    Session as DBSession,
     select,
 )
-from sqlalchemy import Column
-from sqlalchemy.dialects.sqlite import JSON as SQLITE_JSON
+from sqlalchemy import (
+    Column,
+    bindparam,
+    event,
+    Index,
+    and_,
+    delete,
+    func,
+    inspect,
+    insert,
+    or_,
+    text,
+    update,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
 
+# Structured logs (LOG_LEVEL, LOG_FORMAT); writes happen off the event loop
+configure_logging()
+log = logging.getLogger("prosolve")
 
 # ============================================================================
 # FastAPI app + CORS
 # ============================================================================
-app = FastAPI(title="AI Scenario Planner API")
+app = FastAPI(
+    title="AI Scenario Planner API", default_response_class=FastJSONResponse
+)
 llm = LLMClient()
 
+
+# One pooled HTTP client for the app lifetime (keep-alive, optional HTTP/2)
+@app.on_event("startup")
+async def open_llm_client():
+    await llm.start()
+
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    await llm.aclose()
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
     allow_credentials=True,
+    expose_headers=["X-Next-Cursor", "ETag", "X-Request-ID"],
 )
 
+# gzip/brotli for JSON, SSE and NDJSON bodies (COMPRESS_* env vars)
+app.add_middleware(CompressionMiddleware)
+
 
 # ============================================================================
 # Debug middleware (logs full trace as JSON)
@@ -64,21 +155,81 @@ async def debug_errors(request: Request, call_next):
     try:
         return await call_next(request)
     except Exception as e:
-        traceback.print_exc()
+        log.exception("unhandled error", extra={"path": request.url.path})
         return JSONResponse(
             {"error": str(e), "path": request.url.path}, status_code=500
         )
 
 
+# Outermost, so latency includes compression and error handling; the
+# request id is set before anything below logs
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
+
+
 # ============================================================================
-# Simple metrics
+# Metrics (Prometheus text format; backend/utils/metrics.py)
 # ============================================================================
-CALLS = {"count": 0}
+CALLS = REGISTRY.counter(
+    "simulate_requests_total",
+    "Scenarios received by the simulate endpoints",
+    ["endpoint"],
+)
+MOCK_FALLBACKS = REGISTRY.counter(
+    "llm_mock_fallbacks_total",
+    "Responses (or stream sections) filled from mock data after an LLM failure",
+    ["endpoint"],
+)
+
+
+def metrics_snapshot() -> Dict[str, Any]:
+    return {
+        "api_calls": CALLS.total(),
+        "llm_coalesced": llm.coalesced,
+        "llm_scheduler": llm.scheduler.stats(),
+        "llm_resilience": llm.resilience.snapshot(),
+        "cache": response_cache.stats(),
+        "llm_budget": budget.stats(),
+        "fast_pipeline": fast_scenarios.stats(),
+    }
+
+
+def collect_component_stats():
+    # Read at scrape time; the components keep their own counters
+    snapshot = metrics_snapshot()
+    breaker = snapshot["llm_resilience"].pop("breaker")
+    yield "llm_circuit_open", "1 while the LLM circuit breaker is open", float(
+        breaker["state"] == "open"
+    )
+    yield from stat_gauges("llm_breaker", "LLM circuit breaker state", breaker)
+    yield "llm_coalesced", "Calls answered by an identical in-flight call", float(
+        snapshot["llm_coalesced"]
+    )
+    yield from stat_gauges(
+        "llm_scheduler", "LLM rate-limit scheduler", snapshot["llm_scheduler"]
+    )
+    yield from stat_gauges(
+        "llm_resilience", "LLM retries and hedging", snapshot["llm_resilience"]
+    )
+    yield from stat_gauges("response_cache", "LLM response cache", snapshot["cache"])
+    yield from stat_gauges(
+        "llm_budget", "Daily LLM token budget", snapshot["llm_budget"]
+    )
+    yield from stat_gauges(
+        "fast_pipeline", "Heuristic scenario pipeline", snapshot["fast_pipeline"]
+    )
+
+
+REGISTRY.collector(collect_component_stats)
 
 
 @app.get("/metrics")
-def metrics():
-    return {"api_calls": CALLS["count"]}
+def metrics(format: str = Query("prometheus", pattern="^(prometheus|json)$")):
+    if format == "json":
+        return metrics_snapshot()
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4"
+    )
 
 
 # ============================================================================
@@ -99,11 +250,31 @@ def health():
         "llm_provider": llm.provider or "mock",
         "llm_model": llm.model,
         "llm_mock_mode": llm.mock,
+        "llm_circuit_breaker": llm.resilience.breaker.snapshot(),
     }
 
 
 USE_MOCK_ON_FAIL = os.getenv("USE_MOCK_ON_FAIL", "1") == "1"
 
+# LLM_DAILY_TOKEN_BUDGET / LLM_BUDGET_ACTION; seeded from `llm_usage` on startup
+budget = TokenBudget(lambda: today_local())
+
+# System prompts: "legacy" (default) is the hand-written schema in
+# backend/prompts/templates.py, "compact" (opt-in) is compiled from
+# backend/models/lifecycle.py
+SIMULATE_SYSTEM_PROMPT, SECTION_SYSTEM_PROMPTS = prompts_for(PROMPT_VARIANT)
+
+# "single" = one completion for all sections, "sections" = parallel per-section
+# fan-out, "fast" = local heuristic triage (ScenarioResult, no LLM call)
+SIMULATE_MODE = os.getenv("SIMULATE_MODE", "single")
+SIMULATE_MODES = ("single", "sections", "fast")
+
+# classify -> impacts -> scores -> recommendation, memoized per stage
+fast_scenarios = fast_pipeline()
+
+# Cache identity of the fan-out mode (all section prompts together)
+SECTIONS_CACHE_PROMPT = "\n".join(SECTION_SYSTEM_PROMPTS.values())
+
 
 @app.get("/config")
 def config():
@@ -112,56 +283,556 @@ def config():
         "api_base": os.getenv("API_BASE"),
         "model": os.getenv("MODEL"),
         "has_api_key": bool(os.getenv("API_KEY")),
+        "prompt_variant": PROMPT_VARIANT,
         "cwd": os.getcwd(),
     }
 
 
+def simulation_payload(req: SimulateReq) -> Dict[str, Any]:
+    """User message for a scenario, cut to PROMPT_MAX_PAYLOAD_TOKENS."""
+    payload = {"scenario": req.scenario, "context": req.context or {}}
+    return fit_payload(payload, PROMPT_MAX_PAYLOAD_TOKENS)
+
+
 # ============================================================================
 # /simulate (kept behavior)
 # ============================================================================
+def cache_policy(request: Request) -> Tuple[bool, bool]:
+    """
+    (read, write) for the response cache. `X-Cache-Bypass: 1` or
+    `Cache-Control: no-cache` skip the lookup but refresh the entry;
+    `Cache-Control: no-store` skips the cache entirely.
+    """
+    cache_control = request.headers.get("cache-control", "").lower()
+    if "no-store" in cache_control:
+        return False, False
+    if request.headers.get("x-cache-bypass", "") in ("1", "true") or (
+        "no-cache" in cache_control
+    ):
+        return False, True
+    return True, True
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={ms:.1f}" for name, ms in timings.items())
+
+
+def check_mode(mode: Optional[str]) -> str:
+    mode = mode or SIMULATE_MODE
+    if mode not in SIMULATE_MODES:
+        raise HTTPException(
+            status_code=400, detail=f"mode must be one of {SIMULATE_MODES}"
+        )
+    return mode
+
+
+def simulation_cache_key(payload: Dict[str, Any], mode: str) -> str:
+    system = SIMULATE_SYSTEM_PROMPT if mode == "single" else SECTIONS_CACHE_PROMPT
+    return llm.request_key(system, payload)
+
+
+SECTION_REGENERATIONS = REGISTRY.counter(
+    "llm_section_regenerations_total",
+    "Lifecycle sections re-requested after failing validation",
+    ["section", "outcome"],
+)
+
+
+# Scored after the other sections so it rates the features actually listed
+SCORED_SECTION = "feature_impact_scores"
+
+
+async def generate_lifecycle_sections(
+    prompts: Dict[str, str],
+    payload: Dict[str, Any],
+    priority: str,
+    usage: List[Dict[str, Any]],
+    known: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Per-section fan-out for the sections in `prompts`. The feature scores
+    are requested in a second step, with the generated (or `known`)
+    requirements_development.feature_list added to the user message, so the
+    scored names match the listed features.
+    """
+    first = {key: prompt for key, prompt in prompts.items() if key != SCORED_SECTION}
+    result, timings = (
+        await llm.generate_sections(first, payload, priority=priority, usage=usage)
+        if first
+        else ({}, {})
+    )
+    if SCORED_SECTION in prompts:
+        requirements = result.get("requirements_development") or (
+            known or {}
+        ).get("requirements_development")
+        features = (
+            requirements.get("feature_list") if isinstance(requirements, dict) else None
+        )
+        scored_payload = {**payload, "feature_list": features} if features else payload
+        scored, scored_timings = await llm.generate_sections(
+            {SCORED_SECTION: prompts[SCORED_SECTION]},
+            scored_payload,
+            priority=priority,
+            usage=usage,
+        )
+        result.update(scored)
+        timings.update(scored_timings)
+    return {key: result[key] for key in prompts if key in result}, timings
+
+
+async def complete_sections(
+    doc: Dict[str, Any],
+    payload: Dict[str, Any],
+    priority: str,
+    usage: List[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """
+    Validate each lifecycle section and re-request only the missing or
+    invalid ones (one small per-section completion each, in parallel; the
+    feature scores after the rest), merged over the valid ones in section
+    order.
+    Returns (document, regenerated sections, sections still invalid).
+    """
+    valid, invalid = validate_sections(doc)
+    if not invalid:
+        return doc, [], []
+    log.warning("invalid lifecycle sections", extra={"sections": invalid})
+    prompts = {key: SECTION_SYSTEM_PROMPTS[key] for key in invalid}
+    try:
+        regenerated, _ = await generate_lifecycle_sections(
+            prompts, payload, priority, usage, known=valid
+        )
+    except Exception as e:
+        log.error("section regeneration failed: %s: %s", type(e).__name__, e)
+        regenerated = {}
+    fixed, _ = validate_sections({**valid, **regenerated})
+    unresolved = [key for key in invalid if key not in fixed]
+    for key in invalid:
+        outcome = "ok" if key in fixed else "invalid"
+        SECTION_REGENERATIONS.inc(section=key, outcome=outcome)
+
+    merged = {key: fixed[key] for key in SECTION_SYSTEM_PROMPTS if key in fixed}
+    for key, value in doc.items():
+        if key not in merged and key not in unresolved:
+            merged[key] = value
+    return merged, [k for k in invalid if k in fixed], unresolved
+
+
+async def run_simulation(
+    payload: Dict[str, Any],
+    mode: str,
+    cache_read: bool = True,
+    cache_write: bool = True,
+    priority: str = "interactive",
+    cache_checked: bool = False,
+    endpoint: str = "simulate",
+) -> Tuple[Dict[str, Any], str, Dict[str, float]]:
+    """
+    Cache lookup + LLM call shared by /simulate and /simulate/batch.
+    `priority` is the rate-limit scheduler lane for the outbound calls;
+    `cache_checked` means the caller already missed the cache for this key.
+    Returns (analysis, X-Cache status, timings in ms). Fresh analyses carry
+    a `_usage` key (tokens, latency, cost and the `llm_usage` row id);
+    "BUDGET" means mock output was served because the token budget is spent.
+    Sections that fail validation are regenerated on their own; any still
+    invalid after that come from mock data (USE_MOCK_ON_FAIL) and the
+    result is not cached. Mode "fast" returns the heuristic ScenarioResult
+    and touches neither the LLM nor the cache.
+    """
+    if mode == "fast":
+        started = time.perf_counter()
+        values, timings = await fast_scenarios.run(
+            req=scenario_request(payload["scenario"], payload.get("context"))
+        )
+        timings["total"] = (time.perf_counter() - started) * 1000
+        return values["result"].model_dump(), "BYPASS", timings
+
+    # Mock output is free, so only real completions go through the cache
+    use_cache = not llm.mock
+    cache_key = simulation_cache_key(payload, mode)
+    if use_cache and budget.exceeded():
+        if budget.action == "throttle":
+            priority = "background"
+        else:
+            budget.note_diverted()
+            cached = None
+            if budget.action == "cache" and not cache_checked:
+                cached = await response_cache.get(cache_key)
+            if cached is not None:
+                return cached, "HIT", {}
+            return llm.mock_json(payload), "BUDGET", {}
+    if use_cache and cache_read:
+        cached = None if cache_checked else await response_cache.get(cache_key)
+        if cached is not None:
+            return cached, "HIT", {}
+    elif use_cache:
+        response_cache.note_bypass()
+
+    timings: Dict[str, float] = {}
+    usage: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+    if mode == "sections":
+        result, timings = await generate_lifecycle_sections(
+            SECTION_SYSTEM_PROMPTS, payload, priority, usage
+        )
+    else:
+        result = await llm.generate_json(
+            SIMULATE_SYSTEM_PROMPT, payload, priority, usage=usage
+        )
+    if not isinstance(result, dict):
+        raise ValueError("LLM returned non-JSON content")
+    unresolved: List[str] = []
+    if not llm.mock:
+        repair_started = time.perf_counter()
+        result, regenerated, unresolved = await complete_sections(
+            result, payload, priority, usage
+        )
+        if regenerated or unresolved:
+            timings["repair"] = (time.perf_counter() - repair_started) * 1000
+    if unresolved:
+        if not USE_MOCK_ON_FAIL:
+            raise ValueError(f"LLM sections still invalid: {', '.join(unresolved)}")
+        mock = llm.mock_json(payload)
+        result.update((key, mock[key]) for key in unresolved)
+        MOCK_FALLBACKS.inc(len(unresolved), endpoint=f"{endpoint}_section")
+    timings["total"] = (time.perf_counter() - started) * 1000
+
+    if use_cache and cache_write and not unresolved:
+        await response_cache.set(cache_key, result)
+    if usage:
+        # added after caching: a later cache hit cost no tokens
+        summary = await record_usage(usage, payload, endpoint, mode, timings["total"])
+        result = {**result, "_usage": summary}
+    return result, ("MISS" if cache_read else "BYPASS"), timings
+
+
 @app.post("/simulate")
-async def simulate(body: SimulateReq):
-    CALLS["count"] += 1
-    print(f"\n{'=' * 60}")
-    print(f"📥 Received scenario request #{CALLS['count']}")
-    print(f"Scenario: {body.scenario[:100]}...")
-    payload = {"scenario": body.scenario, "context": body.context or {}}
-    print(f"🔧 LLM Config: provider={llm.provider}, model={llm.model}, mock={llm.mock}")
+async def simulate(
+    body: SimulateReq,
+    request: Request,
+    response: Response,
+    mode: Optional[str] = Query(None, description="single | sections | fast"),
+):
+    mode = check_mode(mode)
+    CALLS.inc(endpoint="simulate")
+    payload = simulation_payload(body)
+    log.info(
+        "simulate request",
+        extra={"mode": mode, "provider": llm.provider, "mock": llm.mock},
+    )
+    if payload_sampled(log):
+        log.debug("simulate payload", extra={"payload": payload})
+
+    cache_read, cache_write = cache_policy(request)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    cache_checked = bool(encoding and cache_read and not llm.mock and mode != "fast")
+    if cache_checked:
+        # Hit served from the stored compressed bytes: no JSON or gzip work
+        body = await response_cache.get_encoded(
+            simulation_cache_key(payload, mode), encoding, compress_body
+        )
+        if body is not None:
+            log.info("simulate done", extra={"cache": "HIT", "precompressed": True})
+            return Response(
+                body,
+                media_type="application/json",
+                headers={
+                    "X-Cache": "HIT",
+                    "Content-Encoding": encoding,
+                    "Vary": "Accept-Encoding",
+                },
+            )
 
     try:
-        print("🤖 Calling LLM (Groq)...")
-        result = await llm.generate_json(SIMULATE_SYSTEM_PROMPT, payload)
-        if not isinstance(result, dict):
-            raise ValueError("LLM returned non-JSON content")
-
-        print(f"✅ LLM returned analysis with {len(result)} fields")
-        print(f"   Scores: {result.get('scores', {})}")
-        print(f"   Decision: {result.get('recommendation', {}).get('decision', 'N/A')}")
-        print(f"{'=' * 60}\n")
+        result, cache_status, timings = await run_simulation(
+            payload, mode, cache_read, cache_write, cache_checked=cache_checked
+        )
+        response.headers["X-Cache"] = cache_status
+        if cache_status == "BUDGET":
+            response.headers["X-Fallback"] = "budget"
+        elif cache_status != "HIT":
+            response.headers["Server-Timing"] = server_timing(timings)
+        log.info(
+            "simulate done",
+            extra={
+                "cache": cache_status,
+                "fields": len(result),
+                "timings_ms": {k: round(v, 1) for k, v in timings.items()},
+            },
+        )
+        if payload_sampled(log):
+            log.debug("simulate result", extra={"result": result})
         return result
 
     except httpx.HTTPStatusError as e:
-        print(f"❌ Groq API Error: {e.response.status_code}")
-        print(f"   Response: {e.response.text[:200]}")
+        log.error(
+            "LLM API error",
+            extra={
+                "status": e.response.status_code,
+                "response": e.response.text[:200],
+            },
+        )
         raise HTTPException(status_code=502, detail=e.response.text)
 
     except Exception as e:
-        print(f"❌ Error: {type(e).__name__}: {str(e)}")
-        traceback.print_exc()
+        log.exception("simulate failed: %s: %s", type(e).__name__, e)
 
         if USE_MOCK_ON_FAIL:
-            print("⚠️  Falling back to mock data...")
             try:
-                mock_result = await LLMClient().generate_json("", payload)
-                print("✅ Mock data generated")
+                mock_result = llm.mock_json(payload)
+                MOCK_FALLBACKS.inc(endpoint="simulate")
+                log.warning("simulate fell back to mock data")
+                response.headers["X-Fallback"] = "mock"
                 return mock_result
-            except Exception as mock_err:
-                print(f"❌ Mock fallback also failed: {mock_err}")
+            except Exception:
+                log.exception("mock fallback also failed")
 
-        print(f"{'=' * 60}\n")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================================================
+# /simulate/stream (Server-Sent Events, one event per lifecycle section)
+# ============================================================================
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/simulate/stream")
+async def simulate_stream(body: SimulateReq, request: Request):
+    """
+    Same analysis as /simulate, delivered as SSE. Each top-level section is
+    sent as a `section` event as soon as it closes in the token stream,
+    followed by a final `done` event (or `error` when the stream fails).
+    """
+    CALLS.inc(endpoint="stream")
+    log.info("simulate stream request", extra={"mock": llm.mock})
+    payload = simulation_payload(body)
+
+    cache_read, cache_write = cache_policy(request)
+    use_cache = not llm.mock
+    cache_key = llm.request_key(SIMULATE_SYSTEM_PROMPT, payload)
+    cached = None
+    diverted = None
+    priority = "interactive"
+    if use_cache and budget.exceeded():
+        if budget.action == "throttle":
+            priority = "background"
+        else:
+            budget.note_diverted()
+            if budget.action == "cache":
+                cached = await response_cache.get(cache_key)
+            if cached is None:
+                diverted = llm.mock_json(payload)
+    elif use_cache and cache_read:
+        cached = await response_cache.get(cache_key)
+    elif use_cache:
+        response_cache.note_bypass()
+
+    async def events():
+        if cached is not None:
+            for name, data in cached.items():
+                yield sse_event("section", {"name": name, "data": data})
+            yield sse_event("done", {"sections": list(cached), "cache": "HIT"})
+            return
+        if diverted is not None:
+            for name, data in diverted.items():
+                yield sse_event("section", {"name": name, "data": data})
+            yield sse_event("done", {"sections": list(diverted), "fallback": "budget"})
+            return
+
+        sections: Dict[str, Any] = {}
+        usage: List[Dict[str, Any]] = []
+        started = time.perf_counter()
+        failed = False
+        try:
+            stream = llm.stream_sections(
+                SIMULATE_SYSTEM_PROMPT, payload, priority, usage=usage
+            )
+            async for name, data in stream:
+                sections[name] = data
+                yield sse_event("section", {"name": name, "data": data})
+        except Exception as e:
+            log.error(
+                "stream failed: %s: %s",
+                type(e).__name__,
+                e,
+                extra={"sections_done": len(sections)},
+            )
+            yield sse_event("error", {"detail": str(e)})
+            failed = True
+
+        # Re-request only missing/invalid sections (a later `section` event
+        # replaces an invalid one already sent); skipped when nothing arrived
+        regenerated: List[str] = []
+        unresolved = [k for k in SECTION_SYSTEM_PROMPTS if k not in sections]
+        if not llm.mock and (sections or not failed):
+            sections, regenerated, unresolved = await complete_sections(
+                sections, payload, priority, usage
+            )
+            for name in regenerated:
+                yield sse_event(
+                    "section",
+                    {"name": name, "data": sections[name], "regenerated": True},
+                )
+        usage_summary = None
+        if usage:
+            latency_ms = (time.perf_counter() - started) * 1000
+            usage_summary = await record_usage(
+                usage, payload, "stream", "single", latency_ms
+            )
+        if unresolved:
+            if not USE_MOCK_ON_FAIL:
+                failure: Dict[str, Any] = {
+                    "detail": "LLM did not return every section",
+                    "unresolved": unresolved,
+                }
+                if usage_summary:
+                    failure["usage"] = usage_summary
+                yield sse_event("error", failure)
+                return
+            # Keep what the model delivered, fill the rest from mock
+            MOCK_FALLBACKS.inc(endpoint="stream")
+            mock = llm.mock_json(payload)
+            for name in unresolved:
+                sections[name] = mock[name]
+                yield sse_event(
+                    "section", {"name": name, "data": mock[name], "fallback": True}
+                )
+
+        done: Dict[str, Any] = {"sections": list(sections)}
+        if unresolved:
+            done["fallback"] = True
+        else:
+            if use_cache and cache_write:
+                await response_cache.set(cache_key, sections)
+            done["cache"] = "MISS" if cache_read else "BYPASS"
+        if regenerated:
+            done["regenerated"] = regenerated
+        if usage_summary:
+            done["usage"] = usage_summary
+        yield sse_event("done", done)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================================================
+# /simulate/batch (bounded concurrency, NDJSON results as they complete)
+# ============================================================================
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+BATCH_PERSIST_SIZE = int(os.getenv("BATCH_PERSIST_SIZE", "50"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
+
+class SimulateBatchReq(BaseModel):
+    items: List[SimulateReq] = Field(max_length=BATCH_MAX_ITEMS)
+    concurrency: Optional[int] = Field(default=None, ge=1)
+    persist: bool = False
+    mode: Optional[str] = None
+
+
+@app.post("/simulate/batch")
+async def simulate_batch(body: SimulateBatchReq, request: Request):
+    """
+    Run up to BATCH_MAX_ITEMS scenarios on `concurrency` workers (so at
+    most that many LLM calls in flight) and stream one NDJSON line per item
+    as soon as it completes:
+        {"index": 3, "ok": true, "cache": "MISS", "result": {...}}
+        {"index": 5, "ok": false, "status": 502, "error": "..."}
+    followed by a {"done": true, ...} summary line. With persist=true each
+    successful result is also saved as a Task using batched bulk inserts
+    (task fields come from `context`, falling back to the scenario text).
+    """
+    mode = check_mode(body.mode)
+    limit = min(body.concurrency or BATCH_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    cache_read, cache_write = cache_policy(request)
+    CALLS.inc(len(body.items), endpoint="batch")
+    log.info(
+        "simulate batch request",
+        extra={"items": len(body.items), "concurrency": limit, "mode": mode},
+    )
+
+    async def one(index: int, item: SimulateReq) -> Dict[str, Any]:
+        try:
+            result, cache_status, _ = await run_simulation(
+                simulation_payload(item),
+                mode,
+                cache_read,
+                cache_write,
+                priority="batch",
+                endpoint="batch",
+            )
+        except Exception as e:
+            if isinstance(e, CircuitOpenError):
+                status = 503
+            elif isinstance(e, (LLMHTTPError, httpx.HTTPError)):
+                status = 502
+            else:
+                status = 500
+            log.warning(
+                "batch item %d failed: %s: %s",
+                index,
+                type(e).__name__,
+                str(e)[:200],
+                extra={"status": status},
+            )
+            return {"index": index, "ok": False, "status": status, "error": str(e)}
+        return {"index": index, "ok": True, "cache": cache_status, "result": result}
+
+    # Workers pull items from one shared iterator, so only `limit` items
+    # (and coroutines) are in progress at any time
+    queued = enumerate(body.items)
+    done: asyncio.Queue = asyncio.Queue()
+
+    async def worker() -> None:
+        for index, item in queued:
+            await done.put(await one(index, item))
+
+    async def lines():
+        tasks = [
+            asyncio.create_task(worker()) for _ in range(min(limit, len(body.items)))
+        ]
+        pending_rows: List[Dict[str, Any]] = []
+        summary = {"done": True, "ok": 0, "errors": 0, "persisted": 0}
+
+        async def flush() -> None:
+            try:
+                summary["persisted"] += await bulk_insert_tasks(pending_rows[:])
+            except Exception as e:
+                log.exception("batch persist failed")
+                summary["persist_error"] = str(e)
+            pending_rows.clear()
+
+        try:
+            for _ in body.items:
+                line = await done.get()
+                if line["ok"]:
+                    summary["ok"] += 1
+                    if body.persist:
+                        item = body.items[line["index"]]
+                        row = task_row_from_simulation(item, line["result"])
+                        pending_rows.append(row)
+                        if len(pending_rows) >= BATCH_PERSIST_SIZE:
+                            await flush()
+                else:
+                    summary["errors"] += 1
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+
+            if pending_rows:
+                await flush()
+            yield json.dumps(summary) + "\n"
+        finally:
+            # Client went away mid-batch: stop the workers and their LLM calls
+            for t in tasks:
+                t.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 # ============================================================================
 #                           SQLite Task Storage
 # ============================================================================
@@ -175,18 +846,80 @@ class Task(SQLModel, table=True):
     timeline: str
     resources: Optional[str] = None
 
-    # JSON on SQLite (use typing.List/Dict and explicit JSON columns)
+    # JSON stored compressed (see backend/utils/json_codec.py)
     assumptions: Optional[List[str]] = SQLField(
         default=None,
-        sa_column=Column(SQLITE_JSON),
-    )
-    ai_analysis: Optional[Dict[str, Any]] = SQLField(
-        default=None,
-        sa_column=Column(SQLITE_JSON),
+        sa_column=Column(CompressedJSON),
     )
 
+    # summary copied out of the analysis so list views never load it
+    impact_score: Optional[int] = None
+
     # stored in UTC
     created_at: datetime = SQLField(default_factory=lambda: datetime.now(timezone.utc))
+    # YYYY-MM-DD of created_at in APP_TIMEZONE, set on insert
+    local_date: Optional[str] = None
+
+    __table_args__ = (
+        # keyset pagination on (created_at, id)
+        Index("ix_task_created_at_id", "created_at", "id"),
+        # per-day lists and GROUP BY local_date
+        Index("ix_task_local_date", "local_date", "created_at", "id"),
+    )
+
+
+class TaskAnalysis(SQLModel, table=True):
+    """Full AI analysis of a task, kept out of `task` and loaded on demand."""
+
+    __tablename__ = "task_analysis"
+
+    task_id: int = SQLField(foreign_key="task.id", primary_key=True)
+    ai_analysis: Dict[str, Any] = SQLField(sa_column=Column(CompressedJSON))
+    # plain text picked from the analysis for full-text search (task_fts)
+    search_text: Optional[str] = None
+
+
+class TableVersion(SQLModel, table=True):
+    """Write counter per table; read endpoints derive their ETags from it."""
+
+    __tablename__ = "table_version"
+
+    name: str = SQLField(primary_key=True)
+    version: int = 0
+    # random per database file, so a replaced DB never reuses old ETags
+    epoch: str
+
+
+class LLMUsage(SQLModel, table=True):
+    """Tokens, latency and cost of one request's LLM calls."""
+
+    __tablename__ = "llm_usage"
+    __table_args__ = (Index("ix_llm_usage_local_date", "local_date", "model"),)
+
+    id: Optional[int] = SQLField(default=None, primary_key=True)
+    created_at: datetime
+    local_date: str  # APP_TIMEZONE day, for the daily aggregates and budget
+    endpoint: str  # simulate | stream | batch
+    mode: str  # single | sections
+    model: str
+    calls: int  # upstream completions (one per section in sections mode)
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    latency_ms: float  # wall time of the LLM stage
+    cost_usd: float
+    scenario: str  # first 200 chars, to spot expensive prompts
+    # set when the analysis is saved (aiRaw._usage.id in the task payload)
+    task_id: Optional[int] = SQLField(default=None, foreign_key="task.id", index=True)
+
+
+def bump_task_version():
+    """UPDATE to execute in the same transaction as any write to `task`."""
+    return (
+        update(TableVersion)
+        .where(TableVersion.name == "task")
+        .values(version=TableVersion.version + 1)
+    )
 
 
 # Accept camelCase from the frontend via aliases
@@ -217,46 +950,651 @@ class TaskRead(BaseModel):
     created_at: datetime
 
 
+class TaskSummary(BaseModel):
+    """Card-sized row returned by the list endpoints."""
+
+    id: int
+    name: str
+    timeline: str
+    impact_score: Optional[int]
+    created_at: datetime
+
+
+def impact_score_of(analysis: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Single impact score of a saved analysis (frontend or batch shape)."""
+    if not isinstance(analysis, dict):
+        return None
+    score = analysis.get("impact")
+    if score is None:
+        scores = (analysis.get("aiRaw") or {}).get("feature_impact_scores") or []
+        if scores and isinstance(scores[0], dict):
+            score = scores[0].get("impact_score")
+    try:
+        return int(score)
+    except (TypeError, ValueError):
+        return None
+
+
+def task_read(task: Task, ai_analysis: Optional[Dict[str, Any]]) -> TaskRead:
+    return TaskRead(**task.model_dump(), ai_analysis=ai_analysis)
+
+
+def select_full_tasks():
+    """
+    TaskRead columns joined with the (optional) analysis row. Rows are read
+    as plain mappings, skipping ORM objects and TaskRead validation.
+    """
+    columns = [getattr(Task, f) for f in TaskRead.model_fields if f != "ai_analysis"]
+    return select(*columns, TaskAnalysis.ai_analysis).outerjoin(
+        TaskAnalysis, TaskAnalysis.task_id == Task.id
+    )
+
+
 # DB in project root next to app.py
 DB_URL = os.getenv("DATABASE_URL", "sqlite:///./prosolve.db")
 engine = create_engine(DB_URL, echo=False)
 
 
-def get_session():
-    with DBSession(engine) as session:
+def async_db_url(url: str) -> str:
+    """sqlite:///x.db -> sqlite+aiosqlite:///x.db (explicit drivers are kept)."""
+    scheme, sep, rest = url.partition("://")
+    if scheme == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+# Endpoints use the async engine so DB I/O stays off the request threadpool;
+# the sync engine is kept for create_all and the response cache.
+async_engine = create_async_engine(async_db_url(DB_URL), echo=False)
+
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_seconds", "SQL statement execution time", ["engine", "statement"]
+)
+
+
+def time_queries(sync_engine, label: str) -> None:
+    """Cursor-level timing; labelled by the statement's leading keyword."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is not None:
+            kind = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+            DB_QUERY_SECONDS.observe(
+                time.perf_counter() - started, engine=label, statement=kind
+            )
+
+
+time_queries(engine, "sync")
+time_queries(async_engine.sync_engine, "async")
+
+# Memory LRU in front of the `llm_cache` table in the same DB
+response_cache = ResponseCache(engine)
+
+
+async def get_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
 
 
+def task_row_from_simulation(
+    req: SimulateReq, result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Task column values for a /simulate/batch result (fields from `context`)."""
+    ctx = req.context or {}
+    scores = result.get("feature_impact_scores") or []
+    top = scores[0] if scores and isinstance(scores[0], dict) else {}
+    return {
+        "name": str(ctx.get("name") or req.scenario[:80]),
+        "description": str(ctx.get("description") or req.scenario),
+        "target_market": str(ctx.get("target_market") or ctx.get("targetMarket") or ""),
+        "timeline": str(ctx.get("timeline") or ""),
+        "resources": ctx.get("resources"),
+        "assumptions": ctx.get("assumptions"),
+        # Same keys the frontend stores for a saved analysis
+        "ai_analysis": {
+            "impact": top.get("impact_score"),
+            "impactRationale": top.get("reasoning"),
+            "aiRaw": result,
+        },
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def usage_id_of(analysis: Optional[Dict[str, Any]]) -> Optional[int]:
+    """`_usage.id` of the /simulate result inside a saved analysis, if any."""
+    for doc in (analysis, (analysis or {}).get("aiRaw")):
+        usage = doc.get("_usage") if isinstance(doc, dict) else None
+        if isinstance(usage, dict) and isinstance(usage.get("id"), int):
+            return usage["id"]
+    return None
+
+
+def link_usage_stmt():
+    """executemany-able UPDATE attaching usage rows to the saved task."""
+    table = LLMUsage.__table__
+    return (
+        update(table)
+        .where(table.c.id == bindparam("usage_id"), table.c.task_id.is_(None))
+        .values(task_id=bindparam("linked_task"))
+    )
+
+
+async def record_usage(
+    records: List[Dict[str, Any]],
+    payload: Dict[str, Any],
+    endpoint: str,
+    mode: str,
+    latency_ms: float,
+) -> Dict[str, Any]:
+    """
+    Store one `llm_usage` row for a request's upstream calls and count its
+    tokens against the budget. Returns the summary sent back as `_usage`.
+    """
+    summary: Dict[str, Any] = {
+        "model": records[0]["model"],
+        "calls": len(records),
+        "prompt_tokens": sum(r["prompt_tokens"] for r in records),
+        "completion_tokens": sum(r["completion_tokens"] for r in records),
+        "total_tokens": sum(r["total_tokens"] for r in records),
+        "latency_ms": round(latency_ms, 1),
+        "cost_usd": round(sum(r["cost_usd"] for r in records), 6),
+    }
+    budget.add(summary["total_tokens"])
+    created_at = datetime.now(timezone.utc)
+    try:
+        async with AsyncSession(async_engine) as session:
+            result = await session.execute(
+                insert(LLMUsage).returning(LLMUsage.id),
+                {
+                    **summary,
+                    "created_at": created_at,
+                    "local_date": local_date_str(created_at),
+                    "endpoint": endpoint,
+                    "mode": mode,
+                    "scenario": str(payload.get("scenario", ""))[:200],
+                },
+            )
+            summary["id"] = result.scalar_one()
+            await session.commit()
+    except Exception:
+        # accounting must never fail the analysis itself
+        log.exception("failed to record LLM usage")
+        summary["id"] = None
+    return summary
+
+
+async def bulk_insert_tasks(rows: List[Dict[str, Any]]) -> int:
+    """Insert many tasks (+ their analyses) in two executemany + one commit."""
+    if not rows:
+        return 0
+    analyses = [row.pop("ai_analysis", None) for row in rows]
+    for row, analysis in zip(rows, analyses):
+        row.setdefault("impact_score", impact_score_of(analysis))
+        row.setdefault("local_date", local_date_str(row["created_at"]))
+    async with AsyncSession(async_engine) as session:
+        result = await session.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        )
+        analysis_rows = [
+            {
+                "task_id": task_id,
+                "ai_analysis": analysis,
+                "search_text": analysis_search_text(analysis),
+            }
+            for task_id, analysis in zip(result.scalars().all(), analyses)
+            if analysis is not None
+        ]
+        if analysis_rows:
+            await session.execute(insert(TaskAnalysis), analysis_rows)
+        links = []
+        for row in analysis_rows:
+            usage_id = usage_id_of(row["ai_analysis"])
+            if usage_id is not None:
+                links.append({"usage_id": usage_id, "linked_task": row["task_id"]})
+        if links:
+            await session.execute(link_usage_stmt(), links)
+        await session.execute(bump_task_version())
+        await session.commit()
+    return len(rows)
+
+
+def add_missing_columns(conn, table) -> List[str]:
+    """ALTER TABLE ADD COLUMN for model columns an older DB file lacks."""
+    existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    added = []
+    for column in table.columns:
+        if column.name not in existing:
+            ddl_type = column.type.compile(dialect=conn.dialect)
+            conn.exec_driver_sql(
+                f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {ddl_type}'
+            )
+            added.append(column.name)
+    return added
+
+
+def migrate_task_analysis(conn) -> int:
+    """
+    Copy `task.ai_analysis` (pre-split databases) into `task_analysis`,
+    filling `impact_score` on the way. The old column is only dropped once
+    every legacy value has a `task_analysis` row and SQLite supports DROP
+    COLUMN (3.35+); otherwise it is left in place, unused, and rows still
+    missing are retried on the next startup.
+    """
+    if "ai_analysis" not in {c["name"] for c in inspect(conn).get_columns("task")}:
+        return 0
+    # Rows copied on an earlier startup are skipped, so their impact_score
+    # (maybe updated since) is not reset
+    not_copied = (
+        "FROM task WHERE ai_analysis IS NOT NULL"
+        " AND id NOT IN (SELECT task_id FROM task_analysis)"
+    )
+    legacy = conn.exec_driver_sql(f"SELECT id, ai_analysis {not_copied}").all()
+    moved = []
+    for task_id, raw in legacy:
+        try:
+            analysis = json.loads(raw) if isinstance(raw, str) else raw
+        except json.JSONDecodeError:
+            continue
+        if isinstance(analysis, dict):
+            moved.append({"task_id": task_id, "ai_analysis": analysis})
+    if moved:
+        conn.execute(insert(TaskAnalysis).prefix_with("OR IGNORE"), moved)
+        for row in moved:
+            conn.execute(
+                update(Task)
+                .where(Task.id == row["task_id"])
+                .values(impact_score=impact_score_of(row["ai_analysis"]))
+            )
+
+    left = conn.exec_driver_sql(f"SELECT COUNT(*) {not_copied}").scalar_one()
+    if left:
+        log.warning("kept task.ai_analysis: %d values could not be copied", left)
+    elif sqlite3.sqlite_version_info < (3, 35, 0):
+        log.info(
+            "kept task.ai_analysis: SQLite %s has no DROP COLUMN",
+            sqlite3.sqlite_version,
+        )
+    else:
+        conn.exec_driver_sql("ALTER TABLE task DROP COLUMN ai_analysis")
+    return len(moved)
+
+
+def backfill_local_dates(conn) -> int:
+    """Fill `task.local_date` for rows written before the column existed."""
+    missing = conn.execute(
+        select(Task.id, Task.created_at).where(Task.local_date.is_(None))
+    ).all()
+    for task_id, created_at in missing:
+        conn.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(local_date=local_date_str(created_at))
+        )
+    return len(missing)
+
+
+# --- Full-text search (FTS5) ---
+# Analysis parts worth searching; the rest (scores, lifecycle views derived
+# from aiRaw) would only add noise and index size.
+SEARCH_TEXT_PATHS = [
+    ("impactRationale",),
+    ("recommendation",),
+    ("risks",),
+    ("opportunities",),
+    ("aiRaw", "product_strategy_ideation"),
+    ("aiRaw", "requirements_development", "user_stories"),
+    ("aiRaw", "requirements_development", "feature_list"),
+]
+SEARCH_TEXT_MAX_CHARS = int(os.getenv("SEARCH_TEXT_MAX_CHARS", "8000"))
+
+
+def analysis_search_text(analysis: Optional[Dict[str, Any]]) -> str:
+    """Selected string leaves of an analysis, de-duplicated, capped in size."""
+    parts: List[str] = []
+    seen = set()
+
+    def walk(value: Any) -> None:
+        if isinstance(value, str):
+            value = value.strip()
+            if value and value not in seen:
+                seen.add(value)
+                parts.append(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    for path in SEARCH_TEXT_PATHS:
+        value: Any = analysis
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        walk(value)
+    return "\n".join(parts)[:SEARCH_TEXT_MAX_CHARS]
+
+
+# External-content FTS5 index over a view, so the text itself is stored only
+# once (task columns + task_analysis.search_text). FTS5 needs the exact old
+# values to delete an entry, hence the paired delete/insert triggers.
+_TASK_DOC = """coalesce((SELECT search_text FROM task_analysis
+                          WHERE task_id = {id}), '')"""
+TASK_FTS_DDL = [
+    """CREATE VIEW IF NOT EXISTS task_search_doc AS
+       SELECT t.id AS id, t.name AS name, t.description AS description,
+              t.target_market AS target_market,
+              coalesce(a.search_text, '') AS analysis
+       FROM task t LEFT JOIN task_analysis a ON a.task_id = t.id""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+           name, description, target_market, analysis,
+           content='task_search_doc', content_rowid='id',
+           tokenize='porter unicode61 remove_diacritics 2'
+       )""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN
+           INSERT INTO task_fts(rowid, name, description, target_market, analysis)
+           VALUES (new.id, new.name, new.description, new.target_market,
+                   {_TASK_DOC.format(id="new.id")});
+       END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN
+           INSERT INTO task_fts(task_fts, rowid, name, description,
+                                target_market, analysis)
+           VALUES ('delete', old.id, old.name, old.description,
+                   old.target_market, {_TASK_DOC.format(id="old.id")});
+       END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF
+           name, description, target_market ON task BEGIN
+           INSERT INTO task_fts(task_fts, rowid, name, description,
+                                target_market, analysis)
+           VALUES ('delete', old.id, old.name, old.description,
+                   old.target_market, {_TASK_DOC.format(id="old.id")});
+           INSERT INTO task_fts(rowid, name, description, target_market, analysis)
+           VALUES (new.id, new.name, new.description, new.target_market,
+                   {_TASK_DOC.format(id="new.id")});
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS task_analysis_fts_ai AFTER INSERT ON
+           task_analysis BEGIN
+           INSERT INTO task_fts(task_fts, rowid, name, description,
+                                target_market, analysis)
+           SELECT 'delete', id, name, description, target_market, ''
+           FROM task WHERE id = new.task_id;
+           INSERT INTO task_fts(rowid, name, description, target_market, analysis)
+           SELECT id, name, description, target_market,
+                  coalesce(new.search_text, '')
+           FROM task WHERE id = new.task_id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS task_analysis_fts_ad AFTER DELETE ON
+           task_analysis BEGIN
+           INSERT INTO task_fts(task_fts, rowid, name, description,
+                                target_market, analysis)
+           SELECT 'delete', id, name, description, target_market,
+                  coalesce(old.search_text, '')
+           FROM task WHERE id = old.task_id;
+           INSERT INTO task_fts(rowid, name, description, target_market, analysis)
+           SELECT id, name, description, target_market, ''
+           FROM task WHERE id = old.task_id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS task_analysis_fts_au AFTER UPDATE OF
+           search_text ON task_analysis BEGIN
+           INSERT INTO task_fts(task_fts, rowid, name, description,
+                                target_market, analysis)
+           SELECT 'delete', id, name, description, target_market,
+                  coalesce(old.search_text, '')
+           FROM task WHERE id = old.task_id;
+           INSERT INTO task_fts(rowid, name, description, target_market, analysis)
+           SELECT id, name, description, target_market,
+                  coalesce(new.search_text, '')
+           FROM task WHERE id = new.task_id;
+       END""",
+]
+
+
+def backfill_search_text(conn) -> int:
+    """Extract `search_text` for analyses stored before search existed."""
+    missing = conn.execute(
+        select(TaskAnalysis.task_id, TaskAnalysis.ai_analysis).where(
+            TaskAnalysis.search_text.is_(None)
+        )
+    ).all()
+    for task_id, analysis in missing:
+        conn.execute(
+            update(TaskAnalysis)
+            .where(TaskAnalysis.task_id == task_id)
+            .values(search_text=analysis_search_text(analysis))
+        )
+    return len(missing)
+
+
+def ensure_task_fts(conn) -> bool:
+    """Create the FTS objects; a fresh index is rebuilt from existing rows."""
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE name = 'task_fts'"
+    ).first()
+    for ddl in TASK_FTS_DDL:
+        conn.exec_driver_sql(ddl)
+    if not exists:
+        conn.exec_driver_sql("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+    return not exists
+
+
+def compress_json_columns(conn) -> int:
+    """
+    Load the shared compression dictionaries (training one from existing
+    analyses the first time enough exist), then compress any JSON values
+    still stored as plain text.
+    """
+    codec.load_dictionaries(conn)
+    if codec.enabled and not codec.active_dict_id:
+        samples = conn.execute(
+            select(TaskAnalysis.ai_analysis).limit(500)
+        ).scalars().all()
+        try:
+            if codec.train(conn, samples):
+                log.info("trained JSON dictionary from %d analyses", len(samples))
+        except Exception as e:
+            log.warning("JSON dictionary training skipped: %s", e)
+    converted = compress_legacy_rows(conn, Task.__table__.c.assumptions)
+    converted += compress_legacy_rows(conn, TaskAnalysis.__table__.c.ai_analysis)
+    return converted
+
+
 @app.on_event("startup")
 def on_startup():
     SQLModel.metadata.create_all(engine)
-    print("✅ SQLite ready at", DB_URL)
+    # create_all skips existing tables, so add columns/indexes introduced later
+    with engine.begin() as conn:
+        add_missing_columns(conn, Task.__table__)
+        add_missing_columns(conn, TaskAnalysis.__table__)
+        moved = migrate_task_analysis(conn)
+        backfill_local_dates(conn)
+        compressed = compress_json_columns(conn) if codec.enabled else 0
+        backfill_search_text(conn)
+        if ensure_task_fts(conn):
+            log.info("built full-text index task_fts")
+        conn.execute(
+            insert(TableVersion)
+            .prefix_with("OR IGNORE")
+            .values(name="task", version=0, epoch=secrets.token_hex(4))
+        )
+        # the DB may have been edited while we were down
+        conn.execute(bump_task_version())
+        today = today_local()
+        spent = conn.execute(
+            select(func.coalesce(func.sum(LLMUsage.total_tokens), 0)).where(
+                LLMUsage.local_date == today
+            )
+        ).scalar_one()
+        budget.seed(today, spent)
+    if compressed:
+        log.info("compressed %d JSON values", compressed)
+    if moved:
+        log.info("moved %d analyses into task_analysis", moved)
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    log.info("SQLite ready at %s", DB_URL)
+
+
+@app.on_event("shutdown")
+async def close_db():
+    await async_engine.dispose()
+
+
+# --- Helpers (local dates) ---
+# "Today", history groups and sessions are days in this zone. Rows keep the
+# local_date they were written with; after changing it, NULL the column and
+# restart to recompute.
+APP_TZ = ZoneInfo(os.getenv("APP_TIMEZONE", "America/Chicago"))
+
+
+def local_date_str(dt_utc: datetime) -> str:
+    """YYYY-MM-DD label in APP_TIMEZONE (naive datetimes are UTC)."""
+    if dt_utc.tzinfo is None:
+        dt_utc = dt_utc.replace(tzinfo=timezone.utc)
+    return dt_utc.astimezone(APP_TZ).date().isoformat()
+
+
+def today_local() -> str:
+    return datetime.now(APP_TZ).date().isoformat()
+
+
+# --- Keyset pagination + field projection for list endpoints ---
+TASK_FIELDS = [c.name for c in Task.__table__.columns]
+SUMMARY_FIELDS = list(TaskSummary.model_fields)
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), task_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
 
 
-# --- Helpers (today bounds + local date) ---
-CENTRAL_TZ = ZoneInfo("America/Chicago")
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(task_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def cache_headers(etag: str, next_cursor: Optional[str] = None) -> Dict[str, str]:
+    # no-cache: browsers keep the body but revalidate it with If-None-Match
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return headers
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """`fields=name,timeline` -> Task columns to load (id/created_at always)."""
+    if not fields:
+        return None
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = wanted - set(TASK_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return [f for f in TASK_FIELDS if f in wanted or f in ("id", "created_at")]
 
 
-def today_bounds_chicago() -> Tuple[datetime, datetime]:
+async def list_task_page(
+    session: AsyncSession,
+    filters: List[Any],
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str],
+    etag: str,
+):
     """
-    Return [start_of_today, start_of_tomorrow) in America/Chicago, both as UTC datetimes.
+    Newest-first task summaries matching `filters`, paged on (created_at, id).
+    Without `limit` every row is returned (legacy behavior); with it, the
+    opaque cursor for the next page is sent in the X-Next-Cursor header.
+    `fields` picks other Task columns than the TaskSummary ones; the analysis
+    itself is only served by GET /tasks/{id}.
     """
-    now_cst = datetime.now(CENTRAL_TZ)
-    start_local = datetime(
-        year=now_cst.year, month=now_cst.month, day=now_cst.day, tzinfo=CENTRAL_TZ
+    columns = parse_fields(fields)
+    q = select(*(getattr(Task, f) for f in columns or SUMMARY_FIELDS))
+    for condition in filters:
+        q = q.where(condition)
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        q = q.where(
+            or_(
+                Task.created_at < after_created_at,
+                and_(Task.created_at == after_created_at, Task.id < after_id),
+            )
+        )
+    q = q.order_by(Task.created_at.desc(), Task.id.desc())
+    if limit:
+        q = q.limit(limit + 1)
+
+    rows = (await session.exec(q)).all()
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    # Rows come straight from our own columns: serialize them without a
+    # TaskSummary validation pass (response_model only documents the shape)
+    items = [dict(r._mapping) for r in rows]
+    return FastJSONResponse(items, headers=cache_headers(etag, next_cursor))
+
+
+# --- Conditional GET for task reads ---
+class NotModified(Exception):
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+@app.exception_handler(NotModified)
+async def not_modified(request: Request, exc: NotModified):
+    return Response(status_code=304, headers=cache_headers(exc.etag))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+async def task_etag(
+    request: Request, session: AsyncSession = Depends(get_session)
+) -> str:
+    """
+    Strong ETag for a task read: table version + URL + local day (today and
+    history shift at midnight). A matching If-None-Match is answered with
+    304 before the endpoint runs its query. The version is read on the
+    endpoint's own session, so it shares the query's read transaction.
+    """
+    q = select(TableVersion.epoch, TableVersion.version).where(
+        TableVersion.name == "task"
     )
-    end_local = start_local + timedelta(days=1)
-    return start_local.astimezone(timezone.utc), end_local.astimezone(timezone.utc)
+    epoch, version = (await session.exec(q)).first() or ("0", 0)
+    key = f"{request.url.path}?{request.url.query}|{today_local()}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    etag = f'"{epoch}.{version}.{digest}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise NotModified(etag)
+    return etag
 
 
-def to_local_date_str(dt_utc: datetime) -> str:
-    """YYYY-MM-DD label in America/Chicago."""
-    return dt_utc.astimezone(CENTRAL_TZ).date().isoformat()
+TaskETag = Depends(task_etag)
+PageLimit = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size")
+PageCursor = Query(None, description="Opaque X-Next-Cursor from the previous page")
+PageFields = Query(None, description="Comma-separated Task columns to return")
 
 
 # --- Endpoints ---
 @app.post("/tasks", response_model=TaskRead)
-def add_task(payload: TaskCreate, session: DBSession = Depends(get_session)):
+async def add_task(payload: TaskCreate, session: AsyncSession = Depends(get_session)):
+    created_at = payload.created_at or datetime.now(timezone.utc)
     task = Task(
         name=payload.name,
         description=payload.description,
@@ -264,82 +1602,374 @@ def add_task(payload: TaskCreate, session: DBSession = Depends(get_session)):
         timeline=payload.timeline,
         resources=payload.resources,
         assumptions=payload.assumptions,
-        ai_analysis=payload.ai_analysis,
-        created_at=payload.created_at or datetime.now(timezone.utc),
+        impact_score=impact_score_of(payload.ai_analysis),
+        created_at=created_at,
+        local_date=local_date_str(created_at),
     )
     session.add(task)
-    session.commit()
-    session.refresh(task)
-    return task
+    await session.flush()
+    if payload.ai_analysis is not None:
+        session.add(
+            TaskAnalysis(
+                task_id=task.id,
+                ai_analysis=payload.ai_analysis,
+                search_text=analysis_search_text(payload.ai_analysis),
+            )
+        )
+        usage_id = usage_id_of(payload.ai_analysis)
+        if usage_id is not None:
+            await session.execute(
+                link_usage_stmt(), {"usage_id": usage_id, "linked_task": task.id}
+            )
+    await session.execute(bump_task_version())
+    await session.commit()
+    await session.refresh(task)
+    return task_read(task, payload.ai_analysis)
+
+
+# Rows per insert transaction for /tasks/bulk (override with ?batch_size=)
+TASK_BULK_BATCH_SIZE = int(os.getenv("TASK_BULK_BATCH_SIZE", "500"))
+TASK_BULK_MAX_BATCH_SIZE = 5000
+# Per-row errors listed in the response (all are counted in `failed`)
+TASK_BULK_MAX_ERRORS = int(os.getenv("TASK_BULK_MAX_ERRORS", "1000"))
+
+
+def db_error(e: Exception) -> str:
+    # first line only: SQLAlchemy appends the statement and its parameters
+    return f"{type(e).__name__}: {str(e).splitlines()[0][:200]}"
 
 
-@app.get("/tasks", response_model=List[TaskRead])
-def list_tasks(session: DBSession = Depends(get_session)):
-    q = select(Task).order_by(Task.created_at.desc())
-    return list(session.exec(q))
+def task_row_from_create(payload: TaskCreate) -> Dict[str, Any]:
+    """bulk_insert_tasks row for a validated TaskCreate."""
+    return {
+        "name": payload.name,
+        "description": payload.description,
+        "target_market": payload.target_market,
+        "timeline": payload.timeline,
+        "resources": payload.resources,
+        "assumptions": payload.assumptions,
+        "ai_analysis": payload.ai_analysis,
+        "created_at": payload.created_at or datetime.now(timezone.utc),
+    }
+
+
+@app.post("/tasks/bulk")
+async def bulk_add_tasks(
+    request: Request,
+    batch_size: Optional[int] = Query(
+        None, ge=1, le=TASK_BULK_MAX_BATCH_SIZE, description="Rows per transaction"
+    ),
+):
+    """
+    Import many tasks from NDJSON (one TaskCreate per line) or a JSON array
+    of them. The body is parsed as it streams in and valid rows are inserted
+    `batch_size` at a time, one transaction per batch (same columns, search
+    text and usage links as POST /tasks). Rows that fail to parse or
+    validate are reported by position without stopping the import; a batch
+    that fails to insert is retried row by row:
+        {"received": 3, "inserted": 2, "failed": 1, "batches": 1,
+         "errors": [{"index": 1, "error": "name: Field required"}]}
+    """
+    size = batch_size or TASK_BULK_BATCH_SIZE
+    parser = RowStreamParser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    summary: Dict[str, Any] = {"received": 0, "inserted": 0, "failed": 0, "batches": 0}
+    errors: List[Dict[str, Any]] = []
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+
+    def fail(index: int, message: str) -> None:
+        summary["failed"] += 1
+        if len(errors) < TASK_BULK_MAX_ERRORS:
+            errors.append({"index": index, "error": message})
+
+    def take(rows) -> None:
+        for index, value, error in rows:
+            summary["received"] += 1
+            if error is not None:
+                fail(index, error)
+                continue
+            try:
+                payload = TaskCreate.model_validate(value)
+            except ValidationError as e:
+                first = e.errors()[0]
+                where = ".".join(str(part) for part in first["loc"]) or "row"
+                fail(index, f"{where}: {first['msg']}")
+            else:
+                pending.append((index, task_row_from_create(payload)))
+
+    async def flush(count: int) -> None:
+        batch = pending[:count]
+        del pending[:count]
+        try:
+            # bulk_insert_tasks consumes its rows; keep ours for the retry
+            summary["inserted"] += await bulk_insert_tasks([dict(r) for _, r in batch])
+            summary["batches"] += 1
+            return
+        except Exception as e:
+            log.warning(
+                "bulk task batch failed, retrying rows one by one: %s",
+                db_error(e),
+                extra={"rows": len(batch)},
+            )
+        for index, row in batch:
+            try:
+                summary["inserted"] += await bulk_insert_tasks([row])
+                summary["batches"] += 1
+            except Exception as e:
+                fail(index, db_error(e))
+
+    async for chunk in request.stream():
+        take(parser.feed(decoder.decode(chunk)))
+        while len(pending) >= size:
+            await flush(size)
+        if parser.done:
+            break  # import stopped or array closed: don't read the rest
+    take(parser.feed(decoder.decode(b"", final=True)))
+    take(parser.close())
+    if pending:
+        await flush(len(pending))
+
+    log.info("bulk task import", extra={**summary, "format": parser.format})
+    return {**summary, "errors": errors}
+
+
+@app.get("/tasks", response_model=List[TaskSummary])
+async def list_tasks(
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = PageCursor,
+    fields: Optional[str] = PageFields,
+    etag: str = TaskETag,
+    session: AsyncSession = Depends(get_session),
+):
+    return await list_task_page(session, [], limit, cursor, fields, etag)
 
 
 # Alias for legacy frontend calls
-@app.get("/scenarios", response_model=List[TaskRead])
-def list_scenarios_alias(session: DBSession = Depends(get_session)):
-    q = select(Task).order_by(Task.created_at.desc())
-    return list(session.exec(q))
+@app.get("/scenarios", response_model=List[TaskSummary])
+async def list_scenarios_alias(
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = PageCursor,
+    fields: Optional[str] = PageFields,
+    etag: str = TaskETag,
+    session: AsyncSession = Depends(get_session),
+):
+    return await list_task_page(session, [], limit, cursor, fields, etag)
 
 
 @app.get("/tasks/today", response_model=List[TaskRead])
-def tasks_today(session: DBSession = Depends(get_session)):
-    start_utc, end_utc = today_bounds_chicago()
+async def tasks_today(
+    etag: str = TaskETag, session: AsyncSession = Depends(get_session)
+):
     q = (
-        select(Task)
-        .where(Task.created_at >= start_utc)
-        .where(Task.created_at < end_utc)
-        .order_by(Task.created_at.desc())
+        select_full_tasks()
+        .where(Task.local_date == today_local())
+        .order_by(Task.created_at.desc(), Task.id.desc())
+    )
+    rows = (await session.exec(q)).all()
+    items = [dict(r._mapping) for r in rows]
+    return FastJSONResponse(items, headers=cache_headers(etag))
+
+
+def parse_local_date(value: str) -> str:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+
+
+async def task_days_page(
+    session: AsyncSession,
+    limit: Optional[int],
+    cursor: Optional[str],
+    exclude_today: bool = False,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    ([{"date", "count"}] newest day first, next cursor), grouped on the
+    indexed local_date. The cursor is the last date of the previous page.
+    """
+    q = select(Task.local_date, func.count().label("count")).group_by(
+        Task.local_date
+    )
+    if exclude_today:
+        q = q.where(Task.local_date != today_local())
+    if cursor:
+        q = q.where(Task.local_date < parse_local_date(cursor))
+    q = q.order_by(Task.local_date.desc())
+    if limit:
+        q = q.limit(limit + 1)
+
+    rows = (await session.exec(q)).all()
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].local_date
+    return [{"date": day, "count": count} for day, count in rows], next_cursor
+
+
+def fts_query(q: str) -> str:
+    """
+    User text -> FTS5 MATCH expression: every word must match, each quoted so
+    operators/punctuation are literal; a trailing * keeps prefix search.
+    """
+    terms = []
+    for word in q.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not terms:
+        raise HTTPException(status_code=400, detail="q must contain a search term")
+    return " ".join(terms)
+
+
+class TaskSearchHit(TaskSummary):
+    snippet: str
+    score: float
+
+
+# bm25 column weights: name, description, target_market, analysis
+SEARCH_WEIGHTS = "10.0, 4.0, 2.0, 1.0"
+
+
+@app.get("/tasks/search", response_model=List[TaskSearchHit])
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = PageCursor,
+    etag: str = TaskETag,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Ranked full-text search over name, description, target market and the
+    analysis text. Best matches first (bm25); paged with the same opaque
+    X-Next-Cursor scheme as the list endpoints.
+    """
+    match = fts_query(q)
+    params: Dict[str, Any] = {"match": match, "limit": limit + 1}
+    after = ""
+    if cursor:
+        try:
+            params["score"], params["after_id"] = json.loads(
+                base64.urlsafe_b64decode(cursor.encode())
+            )
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = "WHERE (score, id) > (:score, :after_id)"
+
+    # Rank first, then fetch rows and snippets for the page only
+    page = (
+        await session.execute(
+            text(
+                f"""SELECT id, score FROM (
+                        SELECT rowid AS id, bm25(task_fts, {SEARCH_WEIGHTS}) AS score
+                        FROM task_fts WHERE task_fts MATCH :match
+                    ) {after}
+                    ORDER BY score, id LIMIT :limit"""
+            ),
+            params,
+        )
+    ).all()
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        raw = json.dumps([page[-1].score, page[-1].id]).encode("utf-8")
+        next_cursor = base64.urlsafe_b64encode(raw).decode("ascii")
+    if not page:
+        return FastJSONResponse([], headers=cache_headers(etag))
+
+    ids = [row.id for row in page]
+    summaries = {
+        r.id: dict(r._mapping)
+        for r in await session.exec(
+            select(*(getattr(Task, f) for f in SUMMARY_FIELDS)).where(
+                Task.id.in_(ids)
+            )
+        )
+    }
+    snippet_sql = text(
+        f"""SELECT rowid, snippet(task_fts, -1, '<mark>', '</mark>', '…', 16)
+            FROM task_fts WHERE task_fts MATCH :match
+            AND rowid IN ({", ".join(str(i) for i in ids)})"""
     )
-    return list(session.exec(q))
+    snippets = dict((await session.execute(snippet_sql, {"match": match})).all())
+
+    hits = [
+        {**summaries[row.id], "snippet": snippets.get(row.id, ""), "score": row.score}
+        for row in page
+        if row.id in summaries
+    ]
+    return FastJSONResponse(hits, headers=cache_headers(etag, next_cursor))
+
+
+@app.get("/tasks/days")
+async def task_days(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Days"),
+    cursor: Optional[str] = PageCursor,
+    etag: str = TaskETag,
+    session: AsyncSession = Depends(get_session),
+):
+    """Days that have tasks, with counts, for the history sidebar."""
+    days, next_cursor = await task_days_page(session, limit, cursor)
+    return FastJSONResponse(days, headers=cache_headers(etag, next_cursor))
 
 
 @app.get("/tasks/history")
-def tasks_history_grouped(session: DBSession = Depends(get_session)):
+async def tasks_history_grouped(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Days"),
+    cursor: Optional[str] = PageCursor,
+    etag: str = TaskETag,
+    session: AsyncSession = Depends(get_session),
+):
     """
-    Group tasks by local (America/Chicago) date, excluding today's.
+    Group tasks by local (APP_TIMEZONE) date, excluding today's.
     Returns: {"groups": {"YYYY-MM-DD": [TaskRead,...], ...}}
+    With `limit`, only that many days are loaded per page.
     """
-    start_utc, end_utc = today_bounds_chicago()
-    q = (
-        select(Task)
-        .where(
-            (Task.created_at < start_utc) | (Task.created_at >= end_utc)
-        )  # not today
-        .order_by(Task.created_at.desc())
-    )
-    rows = list(session.exec(q))
-
-    grouped: Dict[str, List[TaskRead]] = {}
-    for t in rows:
-        key = to_local_date_str(t.created_at)
-        grouped.setdefault(key, []).append(
-            TaskRead(
-                id=t.id,
-                name=t.name,
-                description=t.description,
-                target_market=t.target_market,
-                timeline=t.timeline,
-                resources=t.resources,
-                assumptions=t.assumptions,
-                ai_analysis=t.ai_analysis,
-                created_at=t.created_at,
-            )
+    q = select_full_tasks().where(Task.local_date != today_local())
+    next_cursor = None
+    if limit or cursor:
+        days, next_cursor = await task_days_page(
+            session, limit, cursor, exclude_today=True
         )
-    return {"groups": grouped}
+        q = q.where(Task.local_date.in_([d["date"] for d in days]))
+    q = q.add_columns(Task.local_date).order_by(
+        Task.local_date.desc(), Task.created_at.desc(), Task.id.desc()
+    )
+    rows = (await session.exec(q)).all()
+
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for r in rows:
+        task = dict(r._mapping)
+        grouped.setdefault(task.pop("local_date"), []).append(task)
+    return FastJSONResponse(
+        {"groups": grouped}, headers=cache_headers(etag, next_cursor)
+    )
+
+
+@app.get("/tasks/{task_id}", response_model=TaskRead)
+async def get_task(
+    task_id: int, etag: str = TaskETag, session: AsyncSession = Depends(get_session)
+):
+    """One task with its full analysis (list endpoints only return summaries)."""
+    found = (await session.exec(select_full_tasks().where(Task.id == task_id))).first()
+    if not found:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return FastJSONResponse(dict(found._mapping), headers=cache_headers(etag))
 
 
 @app.delete("/tasks/{task_id}")
-def delete_task(task_id: int, session: DBSession = Depends(get_session)):
-    obj = session.get(Task, task_id)
+async def delete_task(task_id: int, session: AsyncSession = Depends(get_session)):
+    obj = await session.get(Task, task_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Task not found")
-    session.delete(obj)
-    session.commit()
+    await session.execute(delete(TaskAnalysis).where(TaskAnalysis.task_id == task_id))
+    # usage stays in the accounting, just no longer tied to a task
+    await session.execute(
+        update(LLMUsage).where(LLMUsage.task_id == task_id).values(task_id=None)
+    )
+    await session.delete(obj)
+    await session.execute(bump_task_version())
+    await session.commit()
     return {"ok": True, "deleted_id": task_id}
 
 
@@ -349,15 +1979,20 @@ def delete_task(task_id: int, session: DBSession = Depends(get_session)):
 
 
 @app.get("/sessions")
-def sessions_alias(session: DBSession = Depends(get_session)):
+async def sessions_alias(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Days"),
+    cursor: Optional[str] = PageCursor,
+    etag: str = TaskETag,
+    session: AsyncSession = Depends(get_session),
+):
     """
     Return the same structure as /tasks/history.
     """
-    return tasks_history_grouped(session)
+    return await tasks_history_grouped(limit, cursor, etag, session)
 
 
 @app.post("/sessions/archive")
-def sessions_archive_noop():
+async def sessions_archive_noop():
     """
     No-op archive endpoint so the UI flow doesn't break.
     You can extend this to actually snapshot tasks if desired.
@@ -365,15 +2000,19 @@ def sessions_archive_noop():
     return {"ok": True}
 
 
-@app.get("/sessions/{session_id}/tasks", response_model=List[TaskRead])
-def sessions_by_date_tasks(
+@app.get("/sessions/{session_id}/tasks", response_model=List[TaskSummary])
+async def sessions_by_date_tasks(
     session_id: str = Path(
-        ..., description="Local date in YYYY-MM-DD (America/Chicago)"
+        ..., description="Local date in YYYY-MM-DD (APP_TIMEZONE)"
     ),
-    session: DBSession = Depends(get_session),
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = PageCursor,
+    fields: Optional[str] = PageFields,
+    etag: str = TaskETag,
+    session: AsyncSession = Depends(get_session),
 ):
     """
-    Treat session_id as a local date (YYYY-MM-DD in America/Chicago) and
+    Treat session_id as a local date (YYYY-MM-DD in APP_TIMEZONE) and
     return all tasks created on that local date.
     """
     try:
@@ -381,18 +2020,91 @@ def sessions_by_date_tasks(
     except ValueError:
         raise HTTPException(status_code=400, detail="session_id must be YYYY-MM-DD")
 
-    # compute the local start/end for that date, convert to UTC for query
-    start_local = datetime(
-        target_date.year, target_date.month, target_date.day, tzinfo=CENTRAL_TZ
+    filters = [Task.local_date == target_date.isoformat()]
+    return await list_task_page(session, filters, limit, cursor, fields, etag)
+
+
+# ============================================================================
+#              LLM usage accounting (rows written by record_usage)
+# ============================================================================
+USAGE_TOTALS = (
+    func.count().label("requests"),
+    func.sum(LLMUsage.calls).label("calls"),
+    func.sum(LLMUsage.prompt_tokens).label("prompt_tokens"),
+    func.sum(LLMUsage.completion_tokens).label("completion_tokens"),
+    func.sum(LLMUsage.total_tokens).label("total_tokens"),
+    func.round(func.sum(LLMUsage.cost_usd), 6).label("cost_usd"),
+    func.round(func.avg(LLMUsage.latency_ms), 1).label("avg_latency_ms"),
+    func.max(LLMUsage.latency_ms).label("max_latency_ms"),
+)
+
+
+def usage_since(days: int):
+    """Filter on the last `days` local days, today included."""
+    start = datetime.now(APP_TZ).date() - timedelta(days=days - 1)
+    return LLMUsage.local_date >= start.isoformat()
+
+
+@app.get("/usage/daily")
+async def usage_daily(
+    days: int = Query(30, ge=1, le=366),
+    session: AsyncSession = Depends(get_session),
+):
+    """Token, cost and latency totals per local day and model, newest first."""
+    q = (
+        select(LLMUsage.local_date.label("date"), LLMUsage.model, *USAGE_TOTALS)
+        .where(usage_since(days))
+        .group_by(LLMUsage.local_date, LLMUsage.model)
+        .order_by(LLMUsage.local_date.desc(), LLMUsage.model)
     )
-    end_local = start_local + timedelta(days=1)
-    start_utc = start_local.astimezone(timezone.utc)
-    end_utc = end_local.astimezone(timezone.utc)
+    rows = (await session.exec(q)).all()
+    return {"budget": budget.stats(), "days": [dict(r._mapping) for r in rows]}
+
 
+@app.get("/usage/models")
+async def usage_by_model(
+    days: int = Query(30, ge=1, le=366),
+    session: AsyncSession = Depends(get_session),
+):
+    """Totals per model (and endpoint) over the last `days` days."""
     q = (
-        select(Task)
-        .where(Task.created_at >= start_utc)
-        .where(Task.created_at < end_utc)
-        .order_by(Task.created_at.desc())
+        select(LLMUsage.model, LLMUsage.endpoint, *USAGE_TOTALS)
+        .where(usage_since(days))
+        .group_by(LLMUsage.model, LLMUsage.endpoint)
+        .order_by(func.sum(LLMUsage.total_tokens).desc())
+    )
+    rows = (await session.exec(q)).all()
+    return [dict(r._mapping) for r in rows]
+
+
+@app.get("/usage/top")
+async def usage_top(
+    days: int = Query(7, ge=1, le=366),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session),
+):
+    """The most expensive requests, with the saved task's name when linked."""
+    q = (
+        select(
+            LLMUsage.id,
+            LLMUsage.created_at,
+            LLMUsage.endpoint,
+            LLMUsage.mode,
+            LLMUsage.model,
+            LLMUsage.calls,
+            LLMUsage.prompt_tokens,
+            LLMUsage.completion_tokens,
+            LLMUsage.total_tokens,
+            LLMUsage.latency_ms,
+            LLMUsage.cost_usd,
+            LLMUsage.scenario,
+            LLMUsage.task_id,
+            Task.name.label("task_name"),
+        )
+        .outerjoin(Task, Task.id == LLMUsage.task_id)
+        .where(usage_since(days))
+        .order_by(LLMUsage.total_tokens.desc(), LLMUsage.id.desc())
+        .limit(limit)
     )
-    return list(session.exec(q))
+    rows = (await session.exec(q)).all()
+    return [dict(r._mapping) for r in rows]
@@ -1,17 +1,30 @@
+from typing import Optional
+
 from backend.models.scenario import ScenarioRequest, ImpactTexts
 from backend.utils.llm_client import LLMClient
 from backend.prompts.templates import SCENARIO_SYSTEM_PROMPT
 
-llm = LLMClient()
+_llm: Optional[LLMClient] = None
+
 
+def default_llm() -> LLMClient:
+    # Created on first use, so importing the agents doesn't build a client
+    global _llm
+    if _llm is None:
+        _llm = LLMClient()
+    return _llm
 
-async def analyze_impacts(req: ScenarioRequest, classification: str) -> ImpactTexts:
+
+async def analyze_impacts(
+    req: ScenarioRequest, classification: str, llm: Optional[LLMClient] = None
+) -> ImpactTexts:
     payload = {
         "scenario": req.scenario,
         "context": (req.context.model_dump() if req.context else {}),
         "classification_hint": classification,
         "need": ["classification", "impacts", "scores", "recommendation"],
     }
+    llm = llm or default_llm()
     out = await llm.generate_json(system=SCENARIO_SYSTEM_PROMPT, user_payload=payload)
     impacts = out.get("impacts") or {
         "risk": "N/A",
@@ -20,3 +33,66 @@ async def analyze_impacts(req: ScenarioRequest, classification: str) -> ImpactTe
         "cost": "N/A",
     }
     return ImpactTexts(**impacts)
+
+
+# Local impact templates per classification (no LLM). The wording carries the
+# keywords score_impacts() looks for, so the scores follow the scenario type.
+_HEURISTIC_IMPACTS = {
+    "pricing_change": (
+        "Price-sensitive accounts may churn or push back at renewal.",
+        "Friction for {segments} at renewal; expect some drop in conversion.",
+        "Repositions the plans against {competitors}; avoid being undercut.",
+        "Little engineering work; billing support questions rise for a few weeks.",
+    ),
+    "feature_remove": (
+        "Users who depend on it may churn; backlash without a migration path.",
+        "Workflow loss for active {segments}; needs notice and an alternative.",
+        "The gap is an opening for {competitors} to position against us.",
+        "Lower maintenance and ops cost once the feature is sunset.",
+    ),
+    "feature_add": (
+        "Delivery risk and scope creep; adoption is unproven.",
+        "New value for {segments} if onboarding surfaces it.",
+        "Can strengthen premium positioning against {competitors}.",
+        "Build effort plus ongoing infra and support.",
+    ),
+    "ux_change": (
+        "Changed flows can confuse existing users during rollout.",
+        "Less friction for {segments} should lift the funnel; watch for a drop "
+        "while users adjust.",
+        "Experience parity or differentiation versus {competitors}.",
+        "Mostly design and engineering time.",
+    ),
+    "ops_cost": (
+        "Reliability risk while the infrastructure changes.",
+        "Invisible to {segments} if performance holds.",
+        "Margin headroom to price against {competitors}.",
+        "Direct infra and compute savings, minus migration effort.",
+    ),
+    "gtm_change": (
+        "The message may not land with the target segment.",
+        "Clearer communication can raise activation among {segments}.",
+        "Sharper positioning against {competitors}.",
+        "Marketing spend and team time.",
+    ),
+    "other": (
+        "Outcome is uncertain; validate with a small experiment first.",
+        "Effect on {segments} unclear until tested.",
+        "Unclear effect on standing against {competitors}.",
+        "Team time to scope and validate.",
+    ),
+}
+
+
+def estimate_impacts(req: ScenarioRequest, classification: str) -> ImpactTexts:
+    """Heuristic impacts from the classification and context, without the LLM."""
+    ctx = req.context
+    segments = ", ".join(ctx.customer_segments) if ctx and ctx.customer_segments else ""
+    competitors = ", ".join(ctx.competitors) if ctx and ctx.competitors else ""
+    risk, customer, competitive, cost = (
+        text.format(
+            segments=segments or "customers", competitors=competitors or "competitors"
+        )
+        for text in _HEURISTIC_IMPACTS.get(classification, _HEURISTIC_IMPACTS["other"])
+    )
+    return ImpactTexts(risk=risk, customer=customer, competitive=competitive, cost=cost)
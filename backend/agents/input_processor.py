@@ -1,15 +1,86 @@
+from typing import Dict, Iterable, List, Tuple
+
+# Keyword -> weight per classification, in priority order: when several
+# classifications match, classify_scenario() returns the first one. Matching
+# is by substring of the lowercased text ("plan" also matches "planning");
+# within a classification, keywords are tried in the order listed.
+KEYWORDS: Dict[str, Dict[str, float]] = {
+    "pricing_change": {"price": 1.0, "pricing": 1.0, "plan": 0.4, "tier": 0.6},
+    "feature_remove": {"remove": 0.8, "sunset": 1.0, "deprecate": 1.0},
+    "feature_add": {
+        "add feature": 1.0,
+        "launch": 0.6,
+        "introduce": 0.6,
+        "premium tier": 1.0,
+    },
+    "ux_change": {"ux": 0.8, "onboarding": 1.0, "flow": 0.5, "funnel": 0.8},
+    "ops_cost": {"infra": 1.0, "compute": 0.8, "server": 0.8, "cost": 0.5},
+    "gtm_change": {
+        "gtm": 1.0,
+        "go-to-market": 1.0,
+        "release notes": 1.0,
+        "comms": 0.8,
+    },
+}
+
+# Flattened once at import: (keyword, classification, weight) in priority
+# order. A loop of C-level `in` scans over this beats a combined regex or a
+# pure-Python automaton in CPython (see scripts/bench_classifier.py).
+_TABLE: Tuple[Tuple[str, str, float], ...] = tuple(
+    (keyword, label, weight)
+    for label, keywords in KEYWORDS.items()
+    for keyword, weight in keywords.items()
+)
+
+
 def classify_scenario(text: str) -> str:
     t = (text or "").lower()
-    if any(k in t for k in ["price", "pricing", "plan", "tier"]):
-        return "pricing_change"
-    if any(k in t for k in ["remove", "sunset", "deprecate"]):
-        return "feature_remove"
-    if any(k in t for k in ["add feature", "launch", "introduce", "premium tier"]):
-        return "feature_add"
-    if any(k in t for k in ["ux", "onboarding", "flow", "funnel"]):
-        return "ux_change"
-    if any(k in t for k in ["infra", "compute", "server", "cost"]):
-        return "ops_cost"
-    if any(k in t for k in ["gtm", "go-to-market", "release notes", "comms"]):
-        return "gtm_change"
+    for keyword, label, _ in _TABLE:
+        if keyword in t:
+            return label
     return "other"
+
+
+def scenario_labels(text: str) -> Dict[str, float]:
+    """
+    Every matching classification with its share of the matched keyword
+    weight (sums to 1), highest first; {"other": 1.0} when nothing matches.
+    """
+    t = (text or "").lower()
+    scores: Dict[str, float] = {}
+    for keyword, label, weight in _TABLE:
+        if keyword in t:
+            scores[label] = scores.get(label, 0.0) + weight
+    if not scores:
+        return {"other": 1.0}
+    total = sum(scores.values())
+    # sorted() is stable, so ties keep priority order
+    ranked = sorted(scores.items(), key=lambda item: -item[1])
+    return {label: round(score / total, 3) for label, score in ranked}
+
+
+def classify_many(texts: Iterable[str]) -> List[str]:
+    """classify_scenario over many texts; repeated texts are classified once."""
+    seen: Dict[str, str] = {}
+    out = []
+    for text in texts:
+        label = seen.get(text)
+        if label is None:
+            label = seen[text] = classify_scenario(text)
+        out.append(label)
+    return out
+
+
+def labels_many(texts: Iterable[str]) -> List[Dict[str, float]]:
+    """
+    scenario_labels over many texts; repeated texts are scored once and
+    share one (read-only) result dict.
+    """
+    seen: Dict[str, Dict[str, float]] = {}
+    out = []
+    for text in texts:
+        labels = seen.get(text)
+        if labels is None:
+            labels = seen[text] = scenario_labels(text)
+        out.append(labels)
+    return out
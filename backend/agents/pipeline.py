@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+from backend.models.scenario import ScenarioContext, ScenarioRequest, ScenarioResult
+from backend.utils.llm_client import LLMClient
+from backend.agents.input_processor import classify_scenario
+from backend.agents.impact_analyzer import analyze_impacts, estimate_impacts
+from backend.agents.risk_modeler import score_impacts
+from backend.agents.recommendation_engine import make_recommendation
+
+# Memoized results kept per stage (LRU); 0 turns memoization off
+PIPELINE_MEMO_SIZE = int(os.getenv("PIPELINE_MEMO_SIZE", "512"))
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of a pipeline. `fn` (sync or async) gets the values named in
+    `deps` positionally; a dep is either a pipeline input or another stage.
+    """
+
+    name: str
+    fn: Callable[..., Any]
+    deps: Tuple[str, ...]
+
+
+def _fingerprint(value: Any) -> str:
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+class Pipeline:
+    """
+    Runs stages in dependency order. Stages whose deps are all available
+    form one wave; the async ones in a wave run concurrently, sync ones run
+    inline (they are local heuristics, cheaper than a task switch).
+
+    Every stage is memoized on its inputs, so re-running a scenario only
+    recomputes stages downstream of what changed. Memoized outputs are
+    shared between runs and must be treated as read-only.
+    """
+
+    def __init__(
+        self, stages: Sequence[Stage], memo_size: int = PIPELINE_MEMO_SIZE
+    ):
+        produced = {stage.name for stage in stages}
+        if len(produced) != len(stages):
+            raise ValueError("duplicate stage names")
+        self.inputs = sorted(
+            {dep for stage in stages for dep in stage.deps} - produced
+        )
+        self.output = stages[-1].name
+
+        # Topological waves, computed once
+        self.waves: List[List[Stage]] = []
+        ready = set(self.inputs)
+        remaining = list(stages)
+        while remaining:
+            wave = [s for s in remaining if set(s.deps) <= ready]
+            if not wave:
+                cycle = ", ".join(s.name for s in remaining)
+                raise ValueError(f"unsatisfiable or cyclic stages: {cycle}")
+            self.waves.append(wave)
+            ready.update(s.name for s in wave)
+            remaining = [s for s in remaining if s not in wave]
+
+        self.memo_size = memo_size
+        self._memo: Dict[str, OrderedDict] = {s.name: OrderedDict() for s in stages}
+        self.hits = 0
+        self.misses = 0
+
+    def _memo_key(self, args: List[Any]) -> str:
+        raw = "\x1f".join(_fingerprint(arg) for arg in args)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _remember(self, name: str, key: str, value: Any) -> None:
+        if not self.memo_size:
+            return
+        memo = self._memo[name]
+        memo[key] = value
+        if len(memo) > self.memo_size:
+            memo.popitem(last=False)
+
+    async def run(self, **inputs: Any) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Returns (every input and stage output by name, stage timings in ms)."""
+        missing = [name for name in self.inputs if name not in inputs]
+        if missing:
+            raise ValueError(f"missing pipeline inputs: {', '.join(missing)}")
+        values: Dict[str, Any] = dict(inputs)
+        timings: Dict[str, float] = {}
+
+        async def timed(stage: Stage, key: str, call) -> None:
+            started = time.perf_counter()
+            values[stage.name] = await call
+            timings[stage.name] = (time.perf_counter() - started) * 1000
+            self._remember(stage.name, key, values[stage.name])
+
+        for wave in self.waves:
+            pending = []
+            for stage in wave:
+                args = [values[dep] for dep in stage.deps]
+                key = self._memo_key(args) if self.memo_size else ""
+                memo = self._memo[stage.name]
+                if key in memo:
+                    memo.move_to_end(key)
+                    values[stage.name] = memo[key]
+                    self.hits += 1
+                    continue
+                self.misses += 1
+                if inspect.iscoroutinefunction(stage.fn):
+                    pending.append(timed(stage, key, stage.fn(*args)))
+                    continue
+                started = time.perf_counter()
+                values[stage.name] = stage.fn(*args)
+                timings[stage.name] = (time.perf_counter() - started) * 1000
+                self._remember(stage.name, key, values[stage.name])
+            if len(pending) == 1:
+                await pending[0]
+            elif pending:
+                await asyncio.gather(*pending)
+        return values, timings
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memo_entries": sum(len(m) for m in self._memo.values()),
+        }
+
+
+def _result(classification, impacts, scores, recommendation) -> ScenarioResult:
+    return ScenarioResult(
+        classification=classification,
+        impacts=impacts,
+        scores=scores,
+        recommendation=recommendation,
+    )
+
+
+def _stages(impacts: Stage) -> List[Stage]:
+    return [
+        Stage("classification", lambda req: classify_scenario(req.scenario), ("req",)),
+        impacts,
+        Stage("scores", score_impacts, ("impacts",)),
+        Stage(
+            "recommendation",
+            make_recommendation,
+            ("impacts", "scores", "classification"),
+        ),
+        Stage(
+            "result",
+            _result,
+            ("classification", "impacts", "scores", "recommendation"),
+        ),
+    ]
+
+
+def fast_pipeline() -> Pipeline:
+    """Local heuristics only: no LLM call, well under a millisecond."""
+    return Pipeline(
+        _stages(Stage("impacts", estimate_impacts, ("req", "classification")))
+    )
+
+
+def llm_pipeline(llm: Optional[LLMClient] = None) -> Pipeline:
+    """Impacts written by the LLM; the other stages stay local."""
+
+    async def impacts(req: ScenarioRequest, classification: str):
+        return await analyze_impacts(req, classification, llm)
+
+    return Pipeline(_stages(Stage("impacts", impacts, ("req", "classification"))))
+
+
+def scenario_request(
+    scenario: str, context: Optional[Dict[str, Any]]
+) -> ScenarioRequest:
+    """
+    ScenarioRequest from a /simulate body. Context keys the agents don't
+    know are ignored; a context that doesn't fit ScenarioContext is dropped.
+    """
+    try:
+        ctx = ScenarioContext.model_validate(context) if context else None
+    except ValidationError:
+        ctx = None
+    return ScenarioRequest(scenario=scenario, context=ctx)
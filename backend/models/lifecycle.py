@@ -0,0 +1,165 @@
+from pydantic import BaseModel, BeforeValidator, Field, TypeAdapter, ValidationError
+from typing import Annotated, Any, Dict, List, Literal, Tuple
+
+# Typed form of the six-section PM lifecycle analysis returned by /simulate.
+# backend/prompts/compiler.py renders these models into the schema part of
+# the system prompt, so field order and descriptions here are prompt text.
+
+
+def _lower(value: Any) -> Any:
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+# "High" is as good as "high"; not worth a regeneration
+Level = Annotated[Literal["high", "medium", "low"], BeforeValidator(_lower)]
+
+
+class ProductStrategyIdeation(BaseModel):
+    problem_summary: str = Field(description="core problem, concise")
+    opportunity_analysis: str = Field(
+        description="market opportunity, user needs, strategic value"
+    )
+    strategic_framing: str = Field(description="fit with product strategy and goals")
+
+
+class UserStory(BaseModel):
+    story: str = Field(description="As a [user], I want [action] so that [benefit]")
+    acceptance_criteria: List[str]
+
+
+class FeatureItem(BaseModel):
+    name: str
+    description: str
+    priority: Level
+
+
+class TaskItem(BaseModel):
+    task: str
+    description: str
+    estimated_effort: Level
+
+
+class RequirementsDevelopment(BaseModel):
+    user_stories: List[UserStory]
+    feature_list: List[FeatureItem] = Field(description="at least 2-3 features")
+    task_breakdown: List[TaskItem]
+
+
+class CompetitorAnalysis(BaseModel):
+    competitor: str = Field(description="name or category")
+    strengths: str
+    weaknesses: str
+    opportunity: str = Field(description="gap for us")
+
+
+class CustomerMarketResearch(BaseModel):
+    competitor_analysis: List[CompetitorAnalysis] = Field(
+        description="at least 2-3 competitors"
+    )
+    gaps_insights: List[str]
+    feasibility_constraints: List[str]
+
+
+class ValidationTest(BaseModel):
+    test: str
+    purpose: str
+    success_criteria: str
+
+
+class UserTestingRound(BaseModel):
+    approach: str
+    participants: str
+    key_questions: List[str]
+    success_criteria: str
+
+
+class PrototypeTestingPlan(BaseModel):
+    what_to_prototype_first: str = Field(description="what and why")
+    quick_validation_tests: List[ValidationTest]
+    first_round_user_testing: UserTestingRound
+
+
+class Persona(BaseModel):
+    name: str
+    description: str
+    pain_points: List[str]
+    goals: List[str]
+
+
+class MessagingPositioning(BaseModel):
+    value_proposition: str
+    key_messages: List[str]
+    positioning: str
+
+
+class LaunchPhase(BaseModel):
+    phase: str
+    description: str
+    timeline: str
+
+
+class MiniLaunchPlan(BaseModel):
+    phases: List[LaunchPhase]
+    channels: List[str]
+    success_metrics: List[str]
+
+
+class SuccessMeasurement(BaseModel):
+    metric: str
+    target: str
+    measurement_method: str
+
+
+class GotoExecution(BaseModel):
+    persona: Persona
+    messaging_positioning: MessagingPositioning
+    mini_launch_plan: MiniLaunchPlan
+    success_measurements: List[SuccessMeasurement]
+
+
+class FeatureImpactScore(BaseModel):
+    feature_name: str = Field(description="a feature_list name")
+    impact_score: int = Field(ge=1, le=100)
+    reasoning: str = Field(description="user value, feasibility, business impact, risk")
+
+
+class LifecycleAnalysis(BaseModel):
+    product_strategy_ideation: ProductStrategyIdeation
+    requirements_development: RequirementsDevelopment
+    customer_market_research: CustomerMarketResearch
+    prototype_testing_plan: PrototypeTestingPlan
+    goto_execution: GotoExecution
+    feature_impact_scores: List[FeatureImpactScore] = Field(
+        min_length=1, description="one per feature, sorted by impact_score desc"
+    )
+
+
+_SECTION_ADAPTERS = {
+    name: TypeAdapter(Annotated[field.annotation, field])
+    for name, field in LifecycleAnalysis.model_fields.items()
+}
+
+
+def validate_sections(doc: Any) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Check each lifecycle section on its own. Returns (valid sections as
+    given, section -> reason) so only the failing ones need regenerating.
+    """
+    valid: Dict[str, Any] = {}
+    invalid: Dict[str, str] = {}
+    doc = doc if isinstance(doc, dict) else {}
+    for name, adapter in _SECTION_ADAPTERS.items():
+        if name not in doc:
+            invalid[name] = "missing"
+            continue
+        try:
+            adapter.validate_python(doc[name])
+        except ValidationError as e:
+            first = e.errors()[0]
+            where = ".".join(str(part) for part in first["loc"]) or name
+            invalid[name] = (
+                f"{e.error_count()} error(s), first at {where}: {first['msg']}"
+            )
+        else:
+            valid[name] = doc[name]
+    return valid, invalid
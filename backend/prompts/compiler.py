@@ -0,0 +1,156 @@
+# backend/prompts/compiler.py
+
+# Builds the lifecycle system prompts from the typed models in
+# backend/models/lifecycle.py instead of hand-written JSON examples.
+#
+# Output is deterministic (model field order, no timestamps), so a given
+# variant is byte-identical across calls and processes. The shared rules come
+# first and the section schema last, so all prompts of a variant start with
+# the same prefix and can reuse the provider's prompt cache.
+
+import json
+import os
+from typing import Any, Dict, List, Tuple, get_args, get_origin, Literal
+
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+try:
+    from backend.models.lifecycle import LifecycleAnalysis
+    from backend.prompts import templates
+except ModuleNotFoundError:
+    from models.lifecycle import LifecycleAnalysis
+    from prompts import templates
+
+SECTIONS: Dict[str, FieldInfo] = LifecycleAnalysis.model_fields
+
+PROMPT_VARIANTS = ("compact", "legacy")
+
+_COMMON = """You are an experienced Product Manager. Analyze the initiative in the user message (JSON: scenario + context) as a real PM would.
+Rules:
+- Output valid JSON only, no markdown. Use the schema's keys and types exactly.
+- Never leave a field empty: if information is missing, make reasonable PM assumptions and say so briefly.
+- Propose 2-3+ distinct features unless the user asks for one; every feature gets an impact score.
+- impact_score: 80-100 build first (high user value, strong business impact, feasible, low risk); 50-79 validate and iterate; 1-49 deprioritize or rethink.
+- Be specific and actionable: reference the input's users, metrics, timeline, resources and constraints; say how to validate before building.
+"""
+
+_ALL_SECTIONS = (
+    "Output one object with all {count} sections in this order, none merged "
+    "or skipped:\n"
+)
+_ONE_SECTION = (
+    'Output only the "{key}" section as {{"{key}": ...}}; the other sections '
+    "are generated separately.\n"
+)
+
+
+def _type(annotation: Any, depth: int) -> str:
+    origin = get_origin(annotation)
+    if origin is Literal:
+        return "|".join(json.dumps(v) for v in get_args(annotation))
+    if origin in (list, List):
+        (item,) = get_args(annotation)
+        inner = _type(item, depth)
+        return f"[{inner}]" if inner.startswith("{") else f"{inner}[]"
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _object(annotation, depth)
+    return {str: "string", int: "int", float: "number", bool: "bool"}.get(
+        annotation, "any"
+    )
+
+
+def _fields(fields: Dict[str, FieldInfo], depth: int) -> str:
+    """`name: type [lo-hi] // description` lines, one indent step per level."""
+    pad = " " * (depth + 1)
+    lines = []
+    for name, field in fields.items():
+        line = f"{pad}{name}: {_type(field.annotation, depth + 1)}"
+        bounds = [
+            getattr(m, attr)
+            for m in field.metadata
+            for attr in ("ge", "le")
+            if getattr(m, attr, None) is not None
+        ]
+        if len(bounds) == 2:
+            line += f" {bounds[0]}-{bounds[1]}"
+        if field.description:
+            line += f" // {field.description}"
+        lines.append(line)
+    return "{\n" + "\n".join(lines) + "\n" + " " * depth + "}"
+
+
+def _object(model: type, depth: int) -> str:
+    return _fields(model.model_fields, depth)
+
+
+def compile_schema(sections: Dict[str, FieldInfo]) -> str:
+    """Compact TypeScript-like schema for the given lifecycle sections."""
+    return _fields(sections, 0) + "\n"
+
+
+def compact_system_prompt() -> str:
+    return (
+        _COMMON
+        + _ALL_SECTIONS.format(count=len(SECTIONS))
+        + compile_schema(SECTIONS)
+    )
+
+
+def compact_section_prompt(key: str) -> str:
+    return (
+        _COMMON
+        + _ONE_SECTION.format(key=key)
+        + compile_schema({key: SECTIONS[key]})
+    )
+
+
+def prompts_for(variant: str) -> Tuple[str, Dict[str, str]]:
+    """(single-shot system prompt, section key -> fan-out prompt)."""
+    if variant == "legacy":
+        return templates.SIMULATE_SYSTEM_PROMPT, templates.SECTION_SYSTEM_PROMPTS
+    if variant != "compact":
+        raise ValueError(
+            f"PROMPT_VARIANT must be one of {PROMPT_VARIANTS}: {variant!r}"
+        )
+    return compact_system_prompt(), {
+        key: compact_section_prompt(key) for key in SECTIONS
+    }
+
+
+# --- User payload ----------------------------------------------------------
+def estimate_tokens(text: str) -> int:
+    """~4 chars/token, the same estimate the rate-limit scheduler uses."""
+    return len(text) // 4
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def fit_payload(payload: Dict[str, Any], max_tokens: int) -> Dict[str, Any]:
+    """
+    Cut the scenario text so the serialized payload stays within
+    `max_tokens` (0 = no limit). Context is structured and kept whole; the
+    scenario keeps its beginning (at least 200 chars) and is marked as
+    truncated.
+    """
+    scenario = payload.get("scenario") or ""
+    if not max_tokens or estimate_tokens(compact_json(payload)) <= max_tokens:
+        return payload
+    others = estimate_tokens(compact_json({**payload, "scenario": ""}))
+    room = max((max_tokens - others) * 4, 200)
+    if len(scenario) <= room:
+        return payload
+    cut = scenario[:room]
+    space = cut.rfind(" ")
+    if space > room * 0.9:
+        cut = cut[:space]
+    return {**payload, "scenario": cut.rstrip() + " …[truncated]"}
+
+
+# "legacy" (hand-written, what the frontend was tuned against) stays the
+# default until the compact variant's output has been evaluated
+PROMPT_VARIANT = os.getenv("PROMPT_VARIANT", "legacy")
+# Scenario text budget for the user message (0 = never truncate)
+PROMPT_MAX_PAYLOAD_TOKENS = int(os.getenv("PROMPT_MAX_PAYLOAD_TOKENS", "0"))
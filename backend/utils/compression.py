@@ -0,0 +1,187 @@
+import os
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:  # optional: better ratios than gzip for repetitive JSON
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/",
+)
+# Each chunk is flushed so clients see events/lines as soon as they're sent
+FLUSHED_TYPES = ("text/event-stream", "application/x-ndjson")
+
+GZIP_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best encoding we can produce for an Accept-Encoding header (br > gzip)."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ("br", "gzip") if brotli is not None else ("gzip",):
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress_body(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31 = gzip container
+    return c.compress(data) + c.flush()
+
+
+class StreamCompressor:
+    """Incremental gzip/brotli; `flush=True` emits every chunk immediately."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._c.process(data)
+            return out + self._c.flush() if flush else out
+        out = self._c.compress(data)
+        return out + self._c.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._c.finish()
+        return self._c.flush()
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI gzip/brotli middleware.
+
+    Whole bodies below `minimum_size` are sent as-is. Streamed bodies
+    (SSE, NDJSON) are compressed incrementally with a sync flush per chunk,
+    so events are not held back. Responses that already carry a
+    Content-Encoding (e.g. pre-compressed cache hits) pass through.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.enabled = os.getenv("COMPRESS_ENABLED", "1") == "1"
+        if minimum_size is None:
+            minimum_size = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        await _Responder(self, encoding, send).run(scope, receive)
+
+
+class _Responder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.app = middleware.app
+        self.minimum_size = middleware.minimum_size
+        self.encoding = encoding
+        self.send = send
+        self.start_message = None
+        self.mode = "pending"  # pending | passthrough | stream
+        self.compressor: Optional[StreamCompressor] = None
+        self.flush_chunks = False
+
+    async def run(self, scope, receive):
+        await self.app(scope, receive, self.on_send)
+
+    def _start(self, length: Optional[int]) -> dict:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if length is None:
+            if "content-length" in headers:
+                del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(length)
+        # Different bytes than the identity body: a strong ETag must not match
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        return self.start_message
+
+    async def on_send(self, message):
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                self.mode = "passthrough"
+                await self.send(message)
+            else:
+                self.flush_chunks = content_type.startswith(FLUSHED_TYPES)
+            return
+
+        if kind != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.mode == "passthrough":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode == "pending":
+            if not more_body:
+                # Whole body known: compress only when it pays off
+                if len(body) < self.minimum_size:
+                    headers = MutableHeaders(raw=self.start_message["headers"])
+                    headers.add_vary_header("Accept-Encoding")
+                    await self.send(self.start_message)
+                    await self.send(message)
+                    return
+                compressed = compress_body(body, self.encoding)
+                await self.send(self._start(len(compressed)))
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            self.mode = "stream"
+            self.compressor = StreamCompressor(self.encoding)
+            await self.send(self._start(None))
+
+        if more_body:
+            chunk = self.compressor.compress(body, flush=self.flush_chunks)
+            if chunk:
+                await self.send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+        else:
+            tail = self.compressor.compress(body, flush=False)
+            tail += self.compressor.finish()
+            await self.send({"type": "http.response.body", "body": tail})
@@ -0,0 +1,50 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:  # optional: several times faster than the stdlib encoder
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Same datetime text as pydantic: naive values without an offset,
+    # UTC-aware ones with "Z"
+    _ORJSON_OPTS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Stdlib fallback for the types orjson handles natively."""
+    if isinstance(obj, datetime):
+        text = obj.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON for trusted, already-shaped data (no validation)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTS)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits: let the stdlib encoder try
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    App-wide response class. Endpoints that return plain dicts/lists built
+    from DB rows can return it directly to skip response_model validation
+    and jsonable_encoder; everything else still goes through FastAPI first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,218 @@
+import os, json
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import LargeBinary, func, select
+from sqlalchemy.types import TypeDecorator
+from sqlmodel import SQLModel, Field
+
+try:  # optional: faster and smaller than zlib when installed
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Stored value = 1 codec byte + 4 byte dictionary id (0 = none) + payload.
+# Neither codec byte can start a JSON document, so values written before
+# compression (plain JSON text) are still read as-is.
+CODEC_ZLIB = 0x01
+CODEC_ZSTD = 0x02
+_HEADER = struct.Struct(">BI")
+
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.){2,80}"\s*:?')
+
+
+class JSONDictionary(SQLModel, table=True):
+    """Shared compression dictionaries, referenced by id from stored values."""
+
+    __tablename__ = "json_dictionary"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    codec: int
+    data: bytes
+    samples: int
+    created_at: float
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def train_zlib_dictionary(samples: List[bytes], size: int) -> bytes:
+    """
+    zlib has no trainer, so build a preset dictionary from the keys and
+    short strings that recur across samples, most valuable last (zlib
+    matches closest to the end of the window most cheaply).
+    """
+    scores: Counter = Counter()
+    for sample in samples:
+        for token in set(_TOKEN.findall(sample.decode("utf-8", "ignore"))):
+            scores[token] += 1
+    ranked = [t for t, n in scores.most_common() if n > 1]
+    picked: List[str] = []
+    used = 0
+    for token in ranked:
+        cost = len(token.encode("utf-8"))
+        if used + cost > size:
+            continue
+        picked.append(token)
+        used += cost
+    return "".join(reversed(picked)).encode("utf-8")
+
+
+class JSONCodec:
+    """
+    Compression settings plus the id -> dictionary registry used by
+    CompressedJSON. Dictionaries live in `json_dictionary` and are loaded
+    with `load_dictionaries()` at startup.
+    """
+
+    def __init__(self):
+        wanted = os.getenv("JSON_COMPRESSION", "auto").lower()
+        if wanted == "auto":
+            wanted = "zstd" if zstandard is not None else "zlib"
+        if wanted == "zstd" and zstandard is None:
+            wanted = "zlib"  # not installed: fall back instead of failing
+        self.enabled = wanted != "off"
+        self.codec = CODEC_ZSTD if wanted == "zstd" else CODEC_ZLIB
+        default_level = "3" if self.codec == CODEC_ZSTD else "6"
+        self.level = int(os.getenv("JSON_COMPRESSION_LEVEL", default_level))
+        # Small values are kept as plain JSON: the header would eat the gain
+        self.min_bytes = int(os.getenv("JSON_COMPRESSION_MIN_BYTES", "256"))
+        self.dict_size = int(os.getenv("JSON_DICT_SIZE", "16384"))
+        self.dict_min_samples = int(os.getenv("JSON_DICT_MIN_SAMPLES", "20"))
+
+        self._dicts: Dict[int, Tuple[int, bytes]] = {}
+        self._zstd_dicts: Dict[int, Any] = {}
+        self.active_dict_id = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------ dictionaries
+    def load_dictionaries(self, conn) -> int:
+        rows = conn.execute(
+            select(JSONDictionary.id, JSONDictionary.codec, JSONDictionary.data)
+        ).all()
+        with self._lock:
+            for dict_id, codec, data in rows:
+                self._dicts[dict_id] = (codec, bytes(data))
+            # newest dictionary for the configured codec is used for writes
+            usable = [i for i, (c, _) in self._dicts.items() if c == self.codec]
+            self.active_dict_id = max(usable, default=0)
+        return len(rows)
+
+    def train(self, conn, samples: Iterable[Any]) -> Optional[int]:
+        """Train and store a dictionary for the configured codec; returns its id."""
+        encoded = [_dumps(s) for s in samples if s is not None]
+        if len(encoded) < self.dict_min_samples:
+            return None
+        if self.codec == CODEC_ZSTD:
+            data = zstandard.train_dictionary(self.dict_size, encoded).as_bytes()
+        else:
+            data = train_zlib_dictionary(encoded, self.dict_size)
+        if not data:
+            return None
+        dict_id = conn.execute(
+            JSONDictionary.__table__.insert().values(
+                codec=self.codec,
+                data=data,
+                samples=len(encoded),
+                created_at=time.time(),
+            )
+        ).inserted_primary_key[0]
+        with self._lock:
+            self._dicts[dict_id] = (self.codec, data)
+            self.active_dict_id = dict_id
+        return dict_id
+
+    def _dict(self, dict_id: int) -> bytes:
+        try:
+            return self._dicts[dict_id][1]
+        except KeyError:
+            raise LookupError(f"Unknown JSON compression dictionary {dict_id}")
+
+    def _zstd_dict(self, dict_id: int):
+        found = self._zstd_dicts.get(dict_id)
+        if found is None:
+            found = zstandard.ZstdCompressionDict(self._dict(dict_id))
+            self._zstd_dicts[dict_id] = found
+        return found
+
+    # ------------------------------------------------------------------ codec
+    def encode(self, value: Any) -> bytes:
+        raw = _dumps(value)
+        if not self.enabled or len(raw) < self.min_bytes:
+            return raw
+        dict_id = self.active_dict_id
+        if self.codec == CODEC_ZSTD:
+            kwargs = {"dict_data": self._zstd_dict(dict_id)} if dict_id else {}
+            body = zstandard.ZstdCompressor(level=self.level, **kwargs).compress(raw)
+        else:
+            if dict_id:
+                c = zlib.compressobj(self.level, zdict=self._dict(dict_id))
+            else:
+                c = zlib.compressobj(self.level)
+            body = c.compress(raw) + c.flush()
+        return _HEADER.pack(self.codec, dict_id) + body
+
+    def decode(self, stored: Any) -> Any:
+        if isinstance(stored, str):
+            return json.loads(stored)  # legacy plain JSON column
+        stored = bytes(stored)
+        if not stored or stored[0] not in (CODEC_ZLIB, CODEC_ZSTD):
+            return json.loads(stored)
+        codec, dict_id = _HEADER.unpack_from(stored)
+        body = memoryview(stored)[_HEADER.size :]
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstd-compressed value but zstandard is missing")
+            kwargs = {"dict_data": self._zstd_dict(dict_id)} if dict_id else {}
+            raw = zstandard.ZstdDecompressor(**kwargs).decompress(body)
+        elif dict_id:
+            d = zlib.decompressobj(zdict=self._dict(dict_id))
+            raw = d.decompress(body) + d.flush()
+        else:
+            raw = zlib.decompress(body)
+        return json.loads(raw)
+
+
+codec = JSONCodec()
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON column stored as a compressed BLOB (plain JSON text still reads)."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return codec.encode(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return codec.decode(value)
+
+
+def compress_legacy_rows(conn, column, batch_size: int = 500) -> int:
+    """
+    One-shot migration: re-encode values of a CompressedJSON `column` that
+    are still stored as plain JSON text (BLOBs are already converted).
+    """
+    table = column.table
+    pk = list(table.primary_key.columns)[0]
+    converted = 0
+    while True:
+        rows = conn.execute(
+            select(pk, column).where(func.typeof(column) == "text").limit(batch_size)
+        ).all()
+        if not rows:
+            return converted
+        for row_key, value in rows:
+            conn.execute(table.update().where(pk == row_key).values({column: value}))
+        converted += len(rows)
@@ -0,0 +1,242 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\r\n\ufeff]*")
+
+# (row index, decoded value, error message)
+Row = Tuple[int, Any, Optional[str]]
+
+
+class SectionStreamParser:
+    """
+    Incremental parser for a streamed top-level JSON object.
+
+    Feed it text chunks as they arrive; `feed()` returns every top-level
+    member (key, value) whose value closed inside that chunk. Only the
+    bracket/string structure is tracked while streaming, each finished
+    value is decoded once with json.loads.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._started = False  # seen the opening "{"
+        self.done = False  # seen the matching "}"
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"  # at depth 1: key -> colon -> value -> comma
+        self._key_start = -1
+        self._key = None
+        self._value_start = -1
+        self._value_kind = ""  # "container" | "string" | "scalar"
+        self.sections: Dict[str, Any] = {}
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.text += chunk
+        out: List[Tuple[str, Any]] = []
+        text = self.text
+        i = self._pos
+        n = len(text)
+        while i < n and not self.done:
+            ch = text[i]
+
+            if not self._started:
+                # Skip anything before the root object (e.g. a markdown fence)
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._expect == "key_string":
+                            self._key = json.loads(text[self._key_start : i + 1])
+                            self._expect = "colon"
+                        elif self._value_kind == "string":
+                            self._emit(out, text[self._value_start : i + 1])
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._expect == "key":
+                        self._key_start = i
+                        self._expect = "key_string"
+                    elif self._expect == "value":
+                        self._value_start = i
+                        self._value_kind = "string"
+                        self._expect = "in_value"
+            elif ch in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._value_start = i
+                    self._value_kind = "container"
+                    self._expect = "in_value"
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._value_kind == "container":
+                    self._emit(out, text[self._value_start : i + 1])
+                elif self._depth == 0:
+                    if self._value_kind == "scalar":
+                        self._emit(out, text[self._value_start : i])
+                    self.done = True
+            elif self._depth == 1:
+                if ch == ":" and self._expect == "colon":
+                    self._expect = "value"
+                elif ch == ",":
+                    if self._value_kind == "scalar":
+                        self._emit(out, text[self._value_start : i])
+                    self._expect = "key"
+                elif not ch.isspace() and self._expect == "value":
+                    # number / true / false / null
+                    self._value_start = i
+                    self._value_kind = "scalar"
+                    self._expect = "in_value"
+            i += 1
+
+        self._pos = i
+        return out
+
+    def _emit(self, out: List[Tuple[str, Any]], raw: str) -> None:
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            pass  # malformed member: skip it, the rest of the object may be fine
+        else:
+            if self._key is not None:
+                self.sections[self._key] = value
+                out.append((self._key, value))
+        self._key = None
+        self._value_kind = ""
+        self._expect = "comma"
+
+
+def parse_complete_sections(text: str) -> Dict[str, Any]:
+    """Top-level members that fully closed in `text`, even if it is truncated."""
+    parser = SectionStreamParser()
+    parser.feed(text)
+    return parser.sections
+
+
+class RowStreamParser:
+    """
+    Incremental parser for a body holding many JSON rows: NDJSON (one value
+    per line) or a single top-level JSON array, decided by the first
+    non-whitespace character.
+
+    `feed()` returns (index, value, error) for every row completed in that
+    chunk and `close()` returns the last one. Array elements are decoded
+    with JSONDecoder.raw_decode straight from the buffer. A malformed NDJSON
+    line is reported and skipped; a malformed array element ends the parse,
+    as there is no reliable point to resume from. Once the parse has ended
+    (`done`), further chunks are ignored.
+    """
+
+    def __init__(self, max_row_chars: int = 1_000_000):
+        self.max_row_chars = max_row_chars
+        self.text = ""
+        self._pos = 0
+        self.format: Optional[str] = None  # "ndjson" | "array"
+        self.index = 0
+        self.done = False
+        self._expect = "value"  # array: value -> comma -> value ...
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, chunk: str) -> List[Row]:
+        if self.done:
+            return []  # stopped: the rest of the body is not kept
+        # consumed text is dropped, so the buffer holds at most one partial row
+        self.text = self.text[self._pos :] + chunk
+        self._pos = 0
+        out = self._drain(final=False)
+        if self.done:
+            self.text, self._pos = "", 0
+        return out
+
+    def close(self) -> List[Row]:
+        out = self._drain(final=True)
+        if self.format == "array" and not self.done:
+            out.append(self._error("unterminated JSON array"))
+        return out
+
+    def _row(self, value: Any, error: Optional[str] = None) -> Row:
+        row = (self.index, value, error)
+        self.index += 1
+        return row
+
+    def _error(self, message: str) -> Row:
+        self.done = True
+        return self._row(None, message)
+
+    def _drain(self, final: bool) -> List[Row]:
+        out: List[Row] = []
+        text = self.text
+        n = len(text)
+        i = self._pos
+        while not self.done:
+            i = _WHITESPACE.match(text, i).end()
+            if i >= n:
+                break
+            if self.format is None:
+                self.format = "array" if text[i] == "[" else "ndjson"
+                if self.format == "array":
+                    i += 1
+                    continue
+
+            if self.format == "ndjson":
+                end = text.find("\n", i)
+                if end == -1:
+                    if n - i > self.max_row_chars:
+                        out.append(self._error("row too large; import stopped"))
+                        break
+                    if not final:
+                        break
+                    end = n
+                try:
+                    out.append(self._row(json.loads(text[i:end])))
+                except json.JSONDecodeError as e:
+                    out.append(self._row(None, f"invalid JSON: {e.msg}"))
+                i = end + 1
+                continue
+
+            ch = text[i]
+            if self._expect == "comma":
+                if ch == ",":
+                    self._expect = "value"
+                    i += 1
+                elif ch == "]":
+                    self.done = True
+                    i += 1
+                else:
+                    out.append(self._error(f"expected ',' or ']' at char {ch!r}"))
+                continue
+            if ch == "]" and self.index == 0:
+                self.done = True  # empty array
+                i += 1
+                continue
+            try:
+                value, end = self._decoder.raw_decode(text, i)
+            except json.JSONDecodeError as e:
+                if final:
+                    out.append(self._error(f"invalid JSON: {e.msg}"))
+                elif n - i > self.max_row_chars:
+                    out.append(self._error("row too large; import stopped"))
+                break  # otherwise the element may still be arriving
+            if end >= n and not final:
+                break  # a number at the end of the buffer may continue
+            out.append(self._row(value))
+            self._expect = "comma"
+            i = end
+
+        self._pos = i
+        return out
@@ -1,11 +1,47 @@
 import os, json
-from typing import Dict, Any
+import asyncio
+import copy
+import hashlib
+import importlib.util
+import logging
+import time
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 import httpx
 from dotenv import load_dotenv, find_dotenv
 
+from .json_stream import SectionStreamParser, parse_complete_sections
+from .metrics import REGISTRY
+from .rate_limiter import RateLimitScheduler
+from .resilience import Resilience, LLMHTTPError
+
 # Load .env ONCE, correctly
 load_dotenv(find_dotenv(), override=True)
 
+log = logging.getLogger("prosolve.llm")
+
+# Stage timings per upstream call: scheduler queue -> HTTP round trip -> parse
+LLM_QUEUE_SECONDS = REGISTRY.histogram(
+    "llm_queue_seconds", "Time spent waiting in the rate-limit scheduler", ["priority"]
+)
+LLM_NETWORK_SECONDS = REGISTRY.histogram(
+    "llm_network_seconds",
+    "Upstream HTTP time (full body, or until headers when streaming)",
+    ["stream", "status"],
+)
+LLM_PARSE_SECONDS = REGISTRY.histogram(
+    "llm_parse_seconds", "Time to decode the completion JSON", ["outcome"]
+)
+LLM_JSON_REPAIRS = REGISTRY.counter(
+    "llm_json_repairs_total", "Completions parsed by the brace-substring fallback"
+)
+LLM_JSON_SALVAGED = REGISTRY.counter(
+    "llm_json_salvaged_total",
+    "Malformed completions reduced to the top-level sections that closed",
+)
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total", "Tokens reported by the provider", ["model", "kind"]
+)
+
 
 class LLMClient:
     def __init__(self):
@@ -17,271 +53,648 @@ class LLMClient:
 
         # ✅ DEFAULT to supported Groq model
         self.model = os.getenv("MODEL") or "llama-3.3-70b-versatile"
+        self.temperature = float(os.getenv("LLM_TEMPERATURE", "0.15"))
+
+        # Shared HTTP client settings (one pooled client per LLMClient)
+        self.timeout = float(os.getenv("LLM_TIMEOUT", "60"))
+        self.connect_timeout = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+        self.max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+        self.max_keepalive = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+        self.keepalive_expiry = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+        self.http2 = os.getenv("LLM_HTTP2", "0") == "1"
+        self.warmup = os.getenv("LLM_WARMUP", "0") == "1"
+        self.section_concurrency = int(os.getenv("LLM_SECTION_CONCURRENCY", "6"))
+
+        # USD per million tokens, for cost accounting (llama-3.3-70b on Groq)
+        self.price_input = float(os.getenv("LLM_PRICE_INPUT_PER_MTOK", "0.59"))
+        self.price_output = float(os.getenv("LLM_PRICE_OUTPUT_PER_MTOK", "0.79"))
+
+        # Outbound RPM/TPM budgets + priority lanes in front of every HTTP call
+        self.scheduler = RateLimitScheduler()
+        self.rate_limit_retries = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "5"))
+        self.expected_completion_tokens = int(
+            os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "2000")
+        )
+
+        # Retries with jitter, optional hedging and a circuit breaker
+        self.resilience = Resilience()
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Single-flight table: request key -> [shared task, live waiter count]
+        self._inflight: Dict[str, List[Any]] = {}
+        self.coalesced = 0
 
     @property
     def mock(self) -> bool:
         """If no API key, run in mock mode so frontend still works."""
         return not (self.provider and self.api_key)
 
+    def request_key(self, system: str, user_payload: Dict[str, Any]) -> str:
+        """
+        Content hash of everything that determines the completion:
+        system prompt, model, temperature and the canonicalized payload.
+        """
+        canonical = json.dumps(
+            {
+                "system": system,
+                "model": self.model,
+                "temperature": self.temperature,
+                "payload": user_payload,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        # HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+        http2 = self.http2 and importlib.util.find_spec("h2") is not None
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            http2=http2,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client, created lazily if start() was never called."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self) -> None:
+        """
+        Open the shared client for the app lifetime (called on FastAPI startup).
+        With LLM_WARMUP=1 a cheap request pre-opens a pooled connection so the
+        first /simulate call skips DNS + TCP + TLS setup.
+        """
+        if self.mock:
+            return
+        client = self.client
+        if self.warmup:
+            try:
+                await client.get(f"{self.api_base}/models")
+            except httpx.HTTPError as e:
+                log.warning("LLM warm-up failed (continuing): %s", e)
+
+    async def aclose(self) -> None:
+        """Close pooled connections (called on FastAPI shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def generate_json(
-        self, system: str, user_payload: Dict[str, Any]
+        self,
+        system: str,
+        user_payload: Dict[str, Any],
+        priority: str = "interactive",
+        usage: Optional[List[Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
         """
         Sends the prompt to the LLM and guarantees a JSON response.
+
+        `priority` picks the scheduler lane ("interactive", "batch" or
+        "background"). Concurrent calls with the same request key share one
+        upstream call: every waiter gets the result (or the same exception),
+        and cancelling one waiter leaves the others running. The shared call
+        is only cancelled once no waiters are left.
+
+        When `usage` is given, the upstream call's `usage_record` is appended
+        to it. Each upstream call is recorded once, by the first waiter with a
+        `usage` list to receive it, so the tokens are still counted when the
+        caller that started the call has gone away.
         """
-        # ✅ MOCK MODE — no API calls burned
         if self.mock:
-            scenario = (user_payload.get("scenario") or "").lower()
-            return {
-                "product_strategy_ideation": {
-                    "problem_summary": "Users struggle with [problem] which impacts [outcome]. This creates [pain point] for [target users].",
-                    "opportunity_analysis": "Market research shows [opportunity]. Users need [need]. This aligns with [strategic value].",
-                    "strategic_framing": "This initiative supports [business goal] by [how]. It aligns with product strategy to [objective]."
-                },
-                "requirements_development": {
-                    "user_stories": [
-                        {
-                            "story": "As a target user, I want to accomplish the main feature goal so that I can solve my problem",
-                            "acceptance_criteria": [
-                                "User can complete primary action",
-                                "Feature works as expected",
-                                "Performance meets requirements"
-                            ]
-                        },
-                        {
-                            "story": "As a user, I want to easily understand the feature so that I can use it effectively",
-                            "acceptance_criteria": [
-                                "Onboarding flow is clear",
-                                "Help documentation is accessible",
-                                "UI is intuitive"
-                            ]
-                        }
+            result, _ = await self._generate_json(system, user_payload, priority)
+            return result
+
+        key = self.request_key(system, user_payload)
+        entry = self._inflight.get(key)
+        leader = entry is None
+        if leader:
+            task = asyncio.ensure_future(
+                self._generate_json(system, user_payload, priority)
+            )
+            entry = [task, 0, False]  # task, waiters, usage recorded
+            self._inflight[key] = entry
+            task.add_done_callback(lambda t, key=key: self._inflight_done(key, t))
+        else:
+            self.coalesced += 1
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            result, record = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+            raise
+        entry[1] -= 1
+
+        if usage is not None and record is not None and not entry[2]:
+            entry[2] = True
+            usage.append(record)
+        # Followers get their own copy so nobody mutates a shared dict
+        return result if leader else copy.deepcopy(result)
+
+    async def generate_sections(
+        self,
+        prompts: Dict[str, str],
+        user_payload: Dict[str, Any],
+        concurrency: Optional[int] = None,
+        priority: str = "interactive",
+        usage: Optional[List[Dict[str, Any]]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Runs one completion per section (section key -> system prompt) with
+        at most `concurrency` in flight, then merges them in `prompts` order.
+        Returns (merged document, per-section wall time in ms).
+        """
+        sem = asyncio.Semaphore(concurrency or self.section_concurrency)
+        timings: Dict[str, float] = {}
+
+        async def one(key: str, system: str) -> Any:
+            async with sem:
+                started = time.perf_counter()
+                out = await self.generate_json(system, user_payload, priority, usage)
+                timings[key] = (time.perf_counter() - started) * 1000
+            # Expect {key: value}; accept a bare section as well
+            if isinstance(out, dict) and key in out:
+                return out[key]
+            return out
+
+        values = await asyncio.gather(
+            *(one(key, system) for key, system in prompts.items()),
+            return_exceptions=True,
+        )
+        for value in values:
+            if isinstance(value, BaseException):
+                raise value
+        return dict(zip(prompts, values)), timings
+
+    def _inflight_done(self, key: str, task: "asyncio.Future") -> None:
+        entry = self._inflight.get(key)
+        if entry is not None and entry[0] is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def mock_json(self, user_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Canned lifecycle analysis used in mock mode and as the failure fallback."""
+        scenario = (user_payload.get("scenario") or "").lower()
+        return {
+            "product_strategy_ideation": {
+                "problem_summary": "Users struggle with [problem] which impacts [outcome]. This creates [pain point] for [target users].",
+                "opportunity_analysis": "Market research shows [opportunity]. Users need [need]. This aligns with [strategic value].",
+                "strategic_framing": "This initiative supports [business goal] by [how]. It aligns with product strategy to [objective]."
+            },
+            "requirements_development": {
+                "user_stories": [
+                    {
+                        "story": "As a target user, I want to accomplish the main feature goal so that I can solve my problem",
+                        "acceptance_criteria": [
+                            "User can complete primary action",
+                            "Feature works as expected",
+                            "Performance meets requirements"
+                        ]
+                    },
+                    {
+                        "story": "As a user, I want to easily understand the feature so that I can use it effectively",
+                        "acceptance_criteria": [
+                            "Onboarding flow is clear",
+                            "Help documentation is accessible",
+                            "UI is intuitive"
+                        ]
+                    }
+                ],
+                "feature_list": [
+                    {
+                        "name": "Core Feature",
+                        "description": "Main functionality that solves the core problem",
+                        "priority": "high"
+                    },
+                    {
+                        "name": "User Onboarding",
+                        "description": "Guide users through feature setup and usage",
+                        "priority": "medium"
+                    },
+                    {
+                        "name": "Analytics & Tracking",
+                        "description": "Track usage and measure success metrics",
+                        "priority": "medium"
+                    }
+                ],
+                "task_breakdown": [
+                    {
+                        "task": "Design core feature flow",
+                        "description": "Create wireframes and user flow diagrams",
+                        "estimated_effort": "medium"
+                    },
+                    {
+                        "task": "Build core functionality",
+                        "description": "Implement main feature logic",
+                        "estimated_effort": "high"
+                    },
+                    {
+                        "task": "Create onboarding flow",
+                        "description": "Build user onboarding experience",
+                        "estimated_effort": "medium"
+                    },
+                    {
+                        "task": "Set up analytics",
+                        "description": "Implement tracking and measurement",
+                        "estimated_effort": "low"
+                    }
+                ]
+            },
+            "customer_market_research": {
+                "competitor_analysis": [
+                    {
+                        "competitor": "Competitor A",
+                        "strengths": "Strong market presence and user base",
+                        "weaknesses": "Complex interface, limited customization",
+                        "opportunity": "We can differentiate with simpler UX and better customization"
+                    },
+                    {
+                        "competitor": "Competitor B",
+                        "strengths": "Innovative features and modern design",
+                        "weaknesses": "Higher cost, steeper learning curve",
+                        "opportunity": "We can offer better value and easier adoption"
+                    }
+                ],
+                "gaps_insights": [
+                    "Market gap: Existing solutions lack [specific feature/benefit]",
+                    "User insight: Users want [specific need] but current solutions don't address it",
+                    "Opportunity: There's demand for [specific solution] in [target market]"
+                ],
+                "feasibility_constraints": [
+                    "Timeline constraint: Must launch within [timeline]",
+                    "Resource constraint: Limited team size affects development capacity",
+                    "Technical constraint: Integration requirements may impact timeline"
+                ]
+            },
+            "prototype_testing_plan": {
+                "what_to_prototype_first": "Start with core feature flow - the main user journey that solves the primary problem. This allows us to validate the core value proposition before building supporting features.",
+                "quick_validation_tests": [
+                    {
+                        "test": "User Interview",
+                        "purpose": "Validate problem understanding and user needs",
+                        "success_criteria": "80% of users confirm the problem is real and important"
+                    },
+                    {
+                        "test": "Clickable Prototype",
+                        "purpose": "Test user flow and usability",
+                        "success_criteria": "70% of users can complete the flow without guidance"
+                    },
+                    {
+                        "test": "Landing Page Test",
+                        "purpose": "Validate messaging and interest",
+                        "success_criteria": "5% conversion rate from visitors to sign-ups"
+                    }
+                ],
+                "first_round_user_testing": {
+                    "approach": "Conduct 1-on-1 user interviews with clickable prototype",
+                    "participants": "10 target users who match the persona",
+                    "key_questions": [
+                        "Does this solve your problem?",
+                        "Is this easy to use?",
+                        "What would prevent you from using this?",
+                        "What's missing?"
                     ],
-                    "feature_list": [
-                        {
-                            "name": "Core Feature",
-                            "description": "Main functionality that solves the core problem",
-                            "priority": "high"
-                        },
-                        {
-                            "name": "User Onboarding",
-                            "description": "Guide users through feature setup and usage",
-                            "priority": "medium"
-                        },
-                        {
-                            "name": "Analytics & Tracking",
-                            "description": "Track usage and measure success metrics",
-                            "priority": "medium"
-                        }
+                    "success_criteria": "80% of users rate it 4+ out of 5 and would use it"
+                }
+            },
+            "goto_execution": {
+                "persona": {
+                    "name": "Primary User",
+                    "description": "Target user who faces the core problem",
+                    "pain_points": [
+                        "Current solutions are too complex",
+                        "Lack of time to learn new tools",
+                        "Need for better efficiency"
                     ],
-                    "task_breakdown": [
-                        {
-                            "task": "Design core feature flow",
-                            "description": "Create wireframes and user flow diagrams",
-                            "estimated_effort": "medium"
-                        },
-                        {
-                            "task": "Build core functionality",
-                            "description": "Implement main feature logic",
-                            "estimated_effort": "high"
-                        },
-                        {
-                            "task": "Create onboarding flow",
-                            "description": "Build user onboarding experience",
-                            "estimated_effort": "medium"
-                        },
-                        {
-                            "task": "Set up analytics",
-                            "description": "Implement tracking and measurement",
-                            "estimated_effort": "low"
-                        }
+                    "goals": [
+                        "Solve the core problem quickly",
+                        "Improve productivity",
+                        "Achieve desired outcome"
                     ]
                 },
-                "customer_market_research": {
-                    "competitor_analysis": [
-                        {
-                            "competitor": "Competitor A",
-                            "strengths": "Strong market presence and user base",
-                            "weaknesses": "Complex interface, limited customization",
-                            "opportunity": "We can differentiate with simpler UX and better customization"
-                        },
-                        {
-                            "competitor": "Competitor B",
-                            "strengths": "Innovative features and modern design",
-                            "weaknesses": "Higher cost, steeper learning curve",
-                            "opportunity": "We can offer better value and easier adoption"
-                        }
+                "messaging_positioning": {
+                    "value_proposition": "[Clear benefit] for [target users] - [how we solve it]",
+                    "key_messages": [
+                        "Solve [problem] in [time/way]",
+                        "Built for [target users] who need [benefit]",
+                        "Simple, effective, and [differentiator]"
                     ],
-                    "gaps_insights": [
-                        "Market gap: Existing solutions lack [specific feature/benefit]",
-                        "User insight: Users want [specific need] but current solutions don't address it",
-                        "Opportunity: There's demand for [specific solution] in [target market]"
-                    ],
-                    "feasibility_constraints": [
-                        "Timeline constraint: Must launch within [timeline]",
-                        "Resource constraint: Limited team size affects development capacity",
-                        "Technical constraint: Integration requirements may impact timeline"
-                    ]
+                    "positioning": "Position as [category] that [differentiator] for [target market]"
                 },
-                "prototype_testing_plan": {
-                    "what_to_prototype_first": "Start with core feature flow - the main user journey that solves the primary problem. This allows us to validate the core value proposition before building supporting features.",
-                    "quick_validation_tests": [
+                "mini_launch_plan": {
+                    "phases": [
                         {
-                            "test": "User Interview",
-                            "purpose": "Validate problem understanding and user needs",
-                            "success_criteria": "80% of users confirm the problem is real and important"
+                            "phase": "Beta Launch",
+                            "description": "Launch to 100 beta users for initial feedback",
+                            "timeline": "Week 1-2"
                         },
                         {
-                            "test": "Clickable Prototype",
-                            "purpose": "Test user flow and usability",
-                            "success_criteria": "70% of users can complete the flow without guidance"
+                            "phase": "Iterate",
+                            "description": "Collect feedback and make improvements",
+                            "timeline": "Week 3-4"
                         },
                         {
-                            "test": "Landing Page Test",
-                            "purpose": "Validate messaging and interest",
-                            "success_criteria": "5% conversion rate from visitors to sign-ups"
+                            "phase": "Public Launch",
+                            "description": "Launch to all users with marketing campaign",
+                            "timeline": "Week 5+"
                         }
                     ],
-                    "first_round_user_testing": {
-                        "approach": "Conduct 1-on-1 user interviews with clickable prototype",
-                        "participants": "10 target users who match the persona",
-                        "key_questions": [
-                            "Does this solve your problem?",
-                            "Is this easy to use?",
-                            "What would prevent you from using this?",
-                            "What's missing?"
-                        ],
-                        "success_criteria": "80% of users rate it 4+ out of 5 and would use it"
-                    }
-                },
-                "goto_execution": {
-                    "persona": {
-                        "name": "Primary User",
-                        "description": "Target user who faces the core problem",
-                        "pain_points": [
-                            "Current solutions are too complex",
-                            "Lack of time to learn new tools",
-                            "Need for better efficiency"
-                        ],
-                        "goals": [
-                            "Solve the core problem quickly",
-                            "Improve productivity",
-                            "Achieve desired outcome"
-                        ]
-                    },
-                    "messaging_positioning": {
-                        "value_proposition": "[Clear benefit] for [target users] - [how we solve it]",
-                        "key_messages": [
-                            "Solve [problem] in [time/way]",
-                            "Built for [target users] who need [benefit]",
-                            "Simple, effective, and [differentiator]"
-                        ],
-                        "positioning": "Position as [category] that [differentiator] for [target market]"
-                    },
-                    "mini_launch_plan": {
-                        "phases": [
-                            {
-                                "phase": "Beta Launch",
-                                "description": "Launch to 100 beta users for initial feedback",
-                                "timeline": "Week 1-2"
-                            },
-                            {
-                                "phase": "Iterate",
-                                "description": "Collect feedback and make improvements",
-                                "timeline": "Week 3-4"
-                            },
-                            {
-                                "phase": "Public Launch",
-                                "description": "Launch to all users with marketing campaign",
-                                "timeline": "Week 5+"
-                            }
-                        ],
-                        "channels": [
-                            "Product blog",
-                            "Email newsletter",
-                            "Social media",
-                            "In-app notifications"
-                        ],
-                        "success_metrics": [
-                            "User sign-ups",
-                            "Feature adoption rate",
-                            "User satisfaction score"
-                        ]
-                    },
-                    "success_measurements": [
-                        {
-                            "metric": "Feature Adoption",
-                            "target": "40% of active users in first 30 days",
-                            "measurement_method": "Analytics dashboard tracking feature usage"
-                        },
-                        {
-                            "metric": "User Satisfaction",
-                            "target": "4.5/5 rating",
-                            "measurement_method": "In-app survey after feature use"
-                        },
-                        {
-                            "metric": "Problem Resolution",
-                            "target": "80% of users report problem solved",
-                            "measurement_method": "Follow-up survey 2 weeks after adoption"
-                        }
+                    "channels": [
+                        "Product blog",
+                        "Email newsletter",
+                        "Social media",
+                        "In-app notifications"
+                    ],
+                    "success_metrics": [
+                        "User sign-ups",
+                        "Feature adoption rate",
+                        "User satisfaction score"
                     ]
                 },
-                "feature_impact_scores": [
+                "success_measurements": [
                     {
-                        "feature_name": "Core Feature",
-                        "impact_score": 85,
-                        "reasoning": "High user value as it solves the core problem. Strong business impact through user satisfaction and retention. Feasible with available resources. Low risk due to clear user need validation."
+                        "metric": "Feature Adoption",
+                        "target": "40% of active users in first 30 days",
+                        "measurement_method": "Analytics dashboard tracking feature usage"
                     },
                     {
-                        "feature_name": "User Onboarding",
-                        "impact_score": 72,
-                        "reasoning": "Important for user adoption but secondary to core functionality. Good business impact through reduced support burden. Feasible with moderate effort. Moderate risk if not done well."
+                        "metric": "User Satisfaction",
+                        "target": "4.5/5 rating",
+                        "measurement_method": "In-app survey after feature use"
                     },
                     {
-                        "feature_name": "Analytics & Tracking",
-                        "impact_score": 65,
-                        "reasoning": "Necessary for measurement and iteration but doesn't directly solve user problem. Moderate business impact through data-driven decisions. Low effort to implement. Low risk."
+                        "metric": "Problem Resolution",
+                        "target": "80% of users report problem solved",
+                        "measurement_method": "Follow-up survey 2 weeks after adoption"
                     }
                 ]
-            }
+            },
+            "feature_impact_scores": [
+                {
+                    "feature_name": "Core Feature",
+                    "impact_score": 85,
+                    "reasoning": "High user value as it solves the core problem. Strong business impact through user satisfaction and retention. Feasible with available resources. Low risk due to clear user need validation."
+                },
+                {
+                    "feature_name": "User Onboarding",
+                    "impact_score": 72,
+                    "reasoning": "Important for user adoption but secondary to core functionality. Good business impact through reduced support burden. Feasible with moderate effort. Moderate risk if not done well."
+                },
+                {
+                    "feature_name": "Analytics & Tracking",
+                    "impact_score": 65,
+                    "reasoning": "Necessary for measurement and iteration but doesn't directly solve user problem. Moderate business impact through data-driven decisions. Low effort to implement. Low risk."
+                }
+            ]
+        }
 
-        # ✅ REAL GROQ MODE
-        if self.provider == "groq":
-            url = f"{self.api_base}/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
+    def _chat_body(self, system: str, user_payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                # compact separators: no whitespace tokens in the user message
+                {
+                    "role": "user",
+                    "content": json.dumps(
+                        user_payload, ensure_ascii=False, separators=(",", ":")
+                    ),
+                },
+            ],
+            "temperature": self.temperature,
+            "response_format": {"type": "json_object"},
+        }
 
-            body = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": json.dumps(user_payload)},
-                ],
-                "temperature": 0.15,
-                "response_format": {"type": "json_object"},
-            }
+    def usage_record(
+        self, usage: Dict[str, Any], latency: float
+    ) -> Dict[str, Any]:
+        """Provider `usage` block -> token counts, latency (ms) and cost."""
+        prompt = int(usage.get("prompt_tokens") or 0)
+        completion = int(usage.get("completion_tokens") or 0)
+        LLM_TOKENS.inc(prompt, model=self.model, kind="prompt")
+        LLM_TOKENS.inc(completion, model=self.model, kind="completion")
+        cost = (prompt * self.price_input + completion * self.price_output) / 1e6
+        return {
+            "model": self.model,
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "total_tokens": int(usage.get("total_tokens") or prompt + completion),
+            "latency_ms": round(latency * 1000, 1),
+            "cost_usd": round(cost, 6),
+        }
 
-            async with httpx.AsyncClient(timeout=60) as client:
-                resp = await client.post(url, headers=headers, json=body)
+    def _estimate_tokens(self, body: Dict[str, Any]) -> int:
+        """Rough prompt size (~4 chars/token) plus the expected completion."""
+        chars = sum(len(m["content"]) for m in body["messages"])
+        return chars // 4 + self.expected_completion_tokens
 
-                # If Groq gives an error, surface it clearly
-                if resp.status_code >= 400:
-                    raise RuntimeError(
-                        f"GROQ ERROR [{resp.status_code}] — model={self.model}\n{resp.text}"
-                    )
+    async def _send(
+        self,
+        body: Dict[str, Any],
+        priority: str,
+        stream: bool = False,
+        spent: Optional[List[Dict[str, Any]]] = None,
+    ) -> httpx.Response:
+        """
+        POST through the rate-limit scheduler. A 429 pauses the scheduler
+        for the provider's retry-after and the call is queued again instead
+        of failing, up to LLM_RATE_LIMIT_RETRIES times.
+
+        Every attempt reserves the token estimate. Attempts that fail or are
+        rejected give it back here; the caller settles the one returned. One
+        cancelled mid-request (e.g. a hedge that lost) is charged the prompt
+        estimate, and that usage is appended to `spent` if given.
+        """
+        url = f"{self.api_base}/chat/completions"
+        estimate = self._estimate_tokens(body)
+        for attempt in range(self.rate_limit_retries + 1):
+            queued = await self.scheduler.acquire(priority, estimate)
+            LLM_QUEUE_SECONDS.observe(queued, priority=priority)
+            request = self.client.build_request("POST", url, json=body)
+            started = time.perf_counter()
+            try:
+                resp = await self.client.send(request, stream=stream)
+            except asyncio.CancelledError:
+                # The provider has most likely read the prompt already
+                prompt = estimate - self.expected_completion_tokens
+                self.scheduler.settle(estimate, prompt)
+                if spent is not None:
+                    spent.append({"prompt_tokens": prompt, "completion_tokens": 0})
+                raise
+            except BaseException:
+                self.scheduler.settle(estimate, 0)
+                raise
+            LLM_NETWORK_SECONDS.observe(
+                time.perf_counter() - started,
+                stream=str(stream).lower(),
+                status=str(resp.status_code),
+            )
+            self.scheduler.observe(resp.headers, resp.status_code)
+            if resp.status_code < 400:
+                return resp
+            # Rejected: nothing was generated, release the reservation
+            self.scheduler.settle(estimate, 0)
+            if resp.status_code != 429 or attempt == self.rate_limit_retries:
+                break
+            await resp.aclose()
 
-                content = resp.json()["choices"][0]["message"]["content"]
+        # If Groq gives an error, surface it clearly
+        text = (await resp.aread()).decode("utf-8", "replace")
+        await resp.aclose()
+        raise LLMHTTPError(
+            resp.status_code,
+            f"GROQ ERROR [{resp.status_code}] — model={self.model}\n{text}",
+        )
+
+    async def stream_sections(
+        self,
+        system: str,
+        user_payload: Dict[str, Any],
+        priority: str = "interactive",
+        usage: Optional[List[Dict[str, Any]]] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Yields (section, value) as soon as each top-level member of the JSON
+        completion closes, using Groq's `stream: true` mode. The usage block
+        of the final chunk (`x_groq.usage`) is appended to `usage` if given.
+        """
+        if self.mock:
+            for item in self.mock_json(user_payload).items():
+                yield item
+            return
+
+        if self.provider != "groq":
+            raise RuntimeError(f"Provider not supported: {self.provider}")
+
+        body = {**self._chat_body(system, user_payload), "stream": True}
+        parser = SectionStreamParser()
+        started = time.perf_counter()
+        reported: Dict[str, Any] = {}
+
+        # Retries/breaker cover getting the stream started; no hedging here
+        resp = await self.resilience.call(
+            lambda: self._send(body, priority, stream=True), hedge=False
+        )
+        try:
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                reported = (
+                    chunk.get("usage")
+                    or (chunk.get("x_groq") or {}).get("usage")
+                    or reported
+                )
+                choices = chunk.get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    for item in parser.feed(delta):
+                        yield item
+        finally:
+            await resp.aclose()
+            # Release the completion-size reservation; when the stream broke
+            # before the usage chunk, count what actually arrived
+            estimated = self._estimate_tokens(body)
+            actual = reported.get("total_tokens")
+            if actual is None:
+                actual = estimated - self.expected_completion_tokens
+                actual += len(parser.text) // 4
+            self.scheduler.settle(estimated, actual)
+
+        if not parser.done:
+            raise RuntimeError(
+                f"LLM stream ended before the JSON object closed:\n{parser.text[-500:]}"
+            )
+        if usage is not None:
+            usage.append(self.usage_record(reported, time.perf_counter() - started))
+
+    async def _generate_json(
+        self,
+        system: str,
+        user_payload: Dict[str, Any],
+        priority: str = "interactive",
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """(parsed completion, usage_record); no record in mock mode."""
+        # ✅ MOCK MODE — no API calls burned
+        if self.mock:
+            return self.mock_json(user_payload), None
+
+        # ✅ REAL GROQ MODE
+        if self.provider == "groq":
+            body = self._chat_body(system, user_payload)
+            estimate = self._estimate_tokens(body)
+            started = time.perf_counter()
+            # Usage of every attempt the provider worked on, including hedges
+            # whose answer was dropped
+            spent: List[Dict[str, Any]] = []
+
+            async def attempt() -> Dict[str, Any]:
+                # Settled per attempt: retries and hedges each hold their own
+                # reservation, failed ones are released inside _send
+                resp = await self._send(body, priority, spent=spent)
+                data = resp.json()
+                usage = data.get("usage") or {}
+                self.scheduler.settle(estimate, usage.get("total_tokens"))
+                spent.append(usage)
+                return data
+
+            data = await self.resilience.call(attempt)
+            usage = spent[0] if len(spent) == 1 else {
+                "prompt_tokens": sum(int(u.get("prompt_tokens") or 0) for u in spent),
+                "completion_tokens": sum(
+                    int(u.get("completion_tokens") or 0) for u in spent
+                ),
+            }
+            record = self.usage_record(usage, time.perf_counter() - started)
+            content = data["choices"][0]["message"]["content"]
 
             # ✅ Parse guaranteed JSON
+            started = time.perf_counter()
+            outcome = "ok"
             try:
-                return json.loads(content)
+                return json.loads(content), record
             except:
                 # Repair malformed JSON from model (rare)
+                outcome = "invalid"
                 start, end = content.find("{"), content.rfind("}")
                 if start != -1 and end != -1:
-                    return json.loads(content[start : end + 1])
+                    try:
+                        parsed = json.loads(content[start : end + 1])
+                    except ValueError:
+                        pass
+                    else:
+                        outcome = "repaired"
+                        LLM_JSON_REPAIRS.inc()
+                        return parsed, record
+                # Truncated or garbled: keep every top-level section that
+                # closed; the caller re-requests the rest
+                salvaged = parse_complete_sections(content)
+                if salvaged:
+                    outcome = "salvaged"
+                    LLM_JSON_SALVAGED.inc()
+                    return salvaged, record
                 raise RuntimeError(f"LLM returned invalid JSON:\n{content}")
+            finally:
+                elapsed = time.perf_counter() - started
+                LLM_PARSE_SECONDS.observe(elapsed, outcome=outcome)
 
         raise RuntimeError(f"Provider not supported: {self.provider}")
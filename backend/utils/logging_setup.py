@@ -0,0 +1,140 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+import secrets
+import sys
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from .fast_json import dumps
+
+# Correlation id of the request being served ("-" outside a request)
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json | text
+# Fraction of requests whose full payloads are logged at DEBUG
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+
+# LogRecord attributes that are not user-supplied `extra=` fields
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps the current request id; runs in the logging (request) thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Enqueue the record with its message merged and any traceback rendered,
+    but leave the final formatting to the listener thread (the stock
+    `prepare` runs the full formatter in the caller).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; `extra=` fields become top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return dumps(entry).decode("utf-8")
+
+
+def configure_logging() -> QueueListener:
+    """
+    Route the `prosolve` loggers through a QueueHandler: callers only
+    enqueue the record, formatting and the stdout write happen on the
+    listener's background thread.
+    """
+    log = logging.getLogger("prosolve")
+    log.setLevel(LOG_LEVEL)
+    log.propagate = False
+
+    stream = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "text":
+        stream.setFormatter(
+            logging.Formatter(
+                "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+            )
+        )
+    else:
+        stream.setFormatter(JsonFormatter())
+
+    handler = _QueueHandler(queue.SimpleQueue())
+    handler.addFilter(RequestIdFilter())
+    log.handlers[:] = [handler]
+
+    listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # drain queued records on exit
+    return listener
+
+
+def payload_sampled(log: logging.Logger) -> bool:
+    """Whether to log full payloads for this call (DEBUG on, and sampled)."""
+    return log.isEnabledFor(logging.DEBUG) and (
+        random.random() < LOG_PAYLOAD_SAMPLE_RATE
+    )
+
+
+class RequestIdMiddleware:
+    """
+    Pure ASGI: takes X-Request-ID from the client (or makes one), exposes it
+    to log records through `request_id`, and echoes it on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid: Optional[str] = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                rid = value.decode("latin-1")[:64]
+                break
+        rid = rid or secrets.token_hex(8)
+        token = request_id.set(rid)
+
+        async def on_send(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = rid
+            await send(message)
+
+        try:
+            await self.app(scope, receive, on_send)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,203 @@
+import os
+import asyncio
+import heapq
+import itertools
+import re
+import time
+from typing import Dict, Any, Optional, List, Tuple, Mapping
+
+# Priority lanes: lower runs first
+PRIORITIES = {"interactive": 0, "batch": 1, "background": 2}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds from provider reset/retry headers: "7.66s", "2m59.56s", "120ms", "3"."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total, matched = 0.0, False
+    for number, unit in _DURATION_PART.findall(value):
+        matched = True
+        total += float(number) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total if matched else None
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at capacity / period."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)  # oversized requests wait for a full bucket
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def sync(self, remaining: float) -> None:
+        """Never believe we have more budget than the provider says we do."""
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+
+
+class RateLimitScheduler:
+    """
+    Outbound scheduler for provider calls.
+
+    Callers `acquire()` a slot before each HTTP request. Slots are handed out
+    strictly by (priority, arrival) once the requests-per-minute and
+    tokens-per-minute buckets allow it, so interactive calls overtake queued
+    batch work. `observe()` feeds the provider's rate-limit headers back in:
+    remaining budgets shrink the buckets and 429/`retry-after` pauses the
+    whole queue instead of letting every waiter fail.
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        # 0 = no local RPM limit; x-ratelimit-remaining-requests still pauses
+        rpm = float(os.getenv("LLM_RPM", "0")) if rpm is None else rpm
+        tpm = float(os.getenv("LLM_TPM", "0")) if tpm is None else tpm
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        # TPM of 0 means "learn it from x-ratelimit-limit-tokens"
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self._heap: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond: Optional[asyncio.Condition] = None
+        self._cond_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._paused_until = 0.0
+        self.counters: Dict[str, float] = {
+            "acquired": 0,
+            "queued": 0,
+            "wait_seconds": 0.0,
+            "rate_limited": 0,
+        }
+
+    @property
+    def cond(self) -> asyncio.Condition:
+        # Conditions bind to the loop that first uses them
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._cond_loop is not loop:
+            self._cond = asyncio.Condition()
+            self._cond_loop = loop
+        return self._cond
+
+    def _delay(self, tokens: float) -> float:
+        delay = self._paused_until - time.monotonic()
+        if self.requests is not None:
+            delay = max(delay, self.requests.wait_time(1))
+        if self.tokens is not None and tokens:
+            delay = max(delay, self.tokens.wait_time(tokens))
+        return delay
+
+    async def acquire(self, priority: str = "interactive", tokens: float = 0) -> float:
+        """Wait for a slot in the given lane; returns the seconds spent queued."""
+        entry = (PRIORITIES.get(priority, PRIORITIES["background"]), next(self._seq))
+        started = time.monotonic()
+        async with self.cond:
+            heapq.heappush(self._heap, entry)
+            self.cond.notify_all()
+            try:
+                while True:
+                    delay: Optional[float] = None
+                    if self._heap[0] == entry:
+                        delay = self._delay(tokens)
+                        if delay <= 0:
+                            heapq.heappop(self._heap)
+                            if self.requests is not None:
+                                self.requests.take(1)
+                            if self.tokens is not None and tokens:
+                                self.tokens.take(tokens)
+                            self.cond.notify_all()
+                            break
+                    try:
+                        await asyncio.wait_for(self.cond.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                # Cancelled while queued: leave the line and wake the next one
+                self._heap.remove(entry)
+                heapq.heapify(self._heap)
+                self.cond.notify_all()
+                raise
+
+        waited = time.monotonic() - started
+        self.counters["acquired"] += 1
+        if waited > 0.001:
+            self.counters["queued"] += 1
+            self.counters["wait_seconds"] += waited
+        return waited
+
+    def settle(self, estimated: float, actual: Optional[float]) -> None:
+        """Correct the token bucket once the real usage of a call is known."""
+        if self.tokens is None or actual is None:
+            return
+        if actual < estimated:
+            self.tokens.give_back(estimated - actual)
+        else:
+            self.tokens.take(actual - estimated)
+
+    def observe(self, headers: Mapping[str, str], status: int) -> Optional[float]:
+        """
+        Adapt to the provider's view of our budget. Returns the back-off in
+        seconds when the provider rejected the call with 429.
+        """
+        limit_tokens = headers.get("x-ratelimit-limit-tokens")
+        if self.tokens is None and limit_tokens and limit_tokens.isdigit():
+            self.tokens = TokenBucket(float(limit_tokens))
+
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if self.tokens is not None and remaining_tokens:
+            try:
+                self.tokens.sync(float(remaining_tokens))
+            except ValueError:
+                pass
+
+        pause = None
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests == "0":
+            pause = parse_duration(headers.get("x-ratelimit-reset-requests"))
+
+        if status == 429:
+            self.counters["rate_limited"] += 1
+            pause = (
+                parse_duration(headers.get("retry-after"))
+                or parse_duration(headers.get("x-ratelimit-reset-tokens"))
+                or parse_duration(headers.get("x-ratelimit-reset-requests"))
+                or 1.0
+            )
+
+        if pause:
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            return pause
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "queue_depth": len(self._heap),
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "rpm_capacity": self.requests.capacity if self.requests else None,
+            "tpm_capacity": self.tokens.capacity if self.tokens else None,
+        }
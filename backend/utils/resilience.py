@@ -0,0 +1,217 @@
+import os
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+
+
+class LLMHTTPError(RuntimeError):
+    """Non-2xx answer from the provider (message keeps the GROQ ERROR format)."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while the breaker is open."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Timeouts, connection errors and 5xx are worth another attempt. 429s are
+    already re-queued by the rate-limit scheduler before they surface here.
+    """
+    if isinstance(exc, LLMHTTPError):
+        return exc.status_code >= 500
+    return isinstance(exc, (httpx.TimeoutException, httpx.TransportError))
+
+
+def is_provider_failure(exc: BaseException) -> bool:
+    """Errors that say the endpoint is unhealthy (not e.g. a bad JSON body)."""
+    return isinstance(exc, (LLMHTTPError, httpx.HTTPError))
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter."""
+
+    def __init__(self):
+        self.max_attempts = max(1, int(os.getenv("LLM_RETRY_ATTEMPTS", "3")))
+        self.base_delay = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+        self.max_delay = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+
+    def delay(self, attempt: int) -> float:
+        """Sleep before retry number `attempt` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures; open ->
+    half_open after `reset_timeout` seconds, where one probe call decides
+    whether to close again or re-open.
+    """
+
+    def __init__(self):
+        self.failure_threshold = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+        self.reset_timeout = float(os.getenv("LLM_BREAKER_RESET", "30"))
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        retry_in = 0.0
+        if self.state == "open":
+            elapsed = time.monotonic() - self.opened_at
+            retry_in = max(0.0, self.reset_timeout - elapsed)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "retry_in": round(retry_in, 3),
+        }
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for hedging decisions."""
+
+    def __init__(self, size: int = 200):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if len(self.samples) < 20:
+            return None  # not enough signal yet
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Resilience:
+    """
+    Wraps one logical LLM call with the circuit breaker, jittered retries on
+    retryable errors and an optional hedged duplicate request that starts
+    once the first attempt is slower than LLM_HEDGE_PERCENTILE of recent calls.
+    """
+
+    def __init__(self):
+        self.retry = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+        # 0 disables hedging, e.g. 95 = hedge once slower than the p95 latency
+        self.hedge_percentile = float(os.getenv("LLM_HEDGE_PERCENTILE", "0"))
+        self.counters = {
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "short_circuited": 0,
+        }
+
+    async def call(
+        self, attempt_fn: Callable[[], Awaitable[Any]], hedge: bool = True
+    ) -> Any:
+        if not self.breaker.allow():
+            self.counters["short_circuited"] += 1
+            raise CircuitOpenError("LLM circuit breaker is open; skipped provider call")
+
+        attempt = 1
+        while True:
+            started = time.monotonic()
+            try:
+                if hedge:
+                    result = await self._hedged(attempt_fn)
+                else:
+                    result = await attempt_fn()
+            except Exception as e:
+                if is_retryable(e) and attempt < self.retry.max_attempts:
+                    self.counters["retries"] += 1
+                    await asyncio.sleep(self.retry.delay(attempt))
+                    attempt += 1
+                    continue
+                if is_provider_failure(e):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                raise
+            except BaseException:
+                # Cancelled: not the provider's fault, free a half-open probe
+                self.breaker.release_probe()
+                raise
+            self.latency.add(time.monotonic() - started)
+            self.breaker.record_success()
+            return result
+
+    async def _hedged(self, attempt_fn: Callable[[], Awaitable[Any]]) -> Any:
+        hedge_after = None
+        if self.hedge_percentile:
+            hedge_after = self.latency.percentile(self.hedge_percentile)
+        if hedge_after is None:
+            return await attempt_fn()
+
+        primary = asyncio.ensure_future(attempt_fn())
+        hedge: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done:
+                return primary.result()
+
+            self.counters["hedges"] += 1
+            hedge = asyncio.ensure_future(attempt_fn())
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for fut in done:
+                    if fut.exception() is None:
+                        if fut is hedge:
+                            self.counters["hedge_wins"] += 1
+                        return fut.result()
+            # Both failed: surface the primary's error
+            return primary.result()
+        finally:
+            losers = [f for f in (primary, hedge) if f is not None and not f.done()]
+            for fut in losers:
+                fut.cancel()
+            if losers:
+                # Let the losers run their cleanup (releasing their rate-limit
+                # reservation, recording their usage) before returning
+                await asyncio.wait(losers)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"breaker": self.breaker.snapshot(), **self.counters}
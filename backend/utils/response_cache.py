@@ -0,0 +1,241 @@
+import os, json
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from sqlalchemy import delete, func
+from sqlmodel import SQLModel, Field, Session, select
+
+
+class LLMCacheEntry(SQLModel, table=True):
+    """Persistent tier of the /simulate response cache (same DB as Task)."""
+
+    __tablename__ = "llm_cache"
+
+    key: str = Field(primary_key=True)
+    value: str  # JSON text of the completion
+    size: int
+    created_at: float
+    expires_at: float = Field(index=True)
+    last_hit_at: float = Field(index=True)
+    hits: int = 0
+
+
+class ResponseCache:
+    """
+    Content-addressed cache for LLM completions.
+
+    Lookups go through a bounded in-process LRU first, then the SQLite
+    `llm_cache` table. Values are stored as serialized JSON so every hit
+    returns a fresh dict that callers may mutate freely. The memory tier
+    also keeps compressed copies of each body (see `get_encoded`), so
+    repeat hits are sent without re-serializing or re-compressing.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.enabled = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+        self.ttl = float(os.getenv("LLM_CACHE_TTL", "86400"))
+        self.max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256"))
+        self.max_bytes = int(os.getenv("LLM_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        self.db_max_rows = int(os.getenv("LLM_CACHE_DB_MAX_ROWS", "5000"))
+
+        # key -> (expires_at, json bytes, {content-encoding: compressed bytes})
+        self._mem: "OrderedDict[str, Tuple[float, bytes, Dict[str, bytes]]]" = (
+            OrderedDict()
+        )
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.counters = {
+            "hits_memory": 0,
+            "hits_db": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "precompressed_hits": 0,
+            "writes": 0,
+            "evictions": 0,
+        }
+
+    # ------------------------------------------------------------------ memory
+    def _mem_get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._mem.get(key)
+            if item is None:
+                return None
+            expires_at, raw, _ = item
+            if expires_at <= time.time():
+                self._mem_pop(key)
+                return None
+            self._mem.move_to_end(key)
+            return raw
+
+    def _mem_put(self, key: str, raw: bytes, expires_at: float) -> None:
+        if len(raw) > self.max_bytes:
+            return
+        with self._lock:
+            self._mem_pop(key)
+            self._mem[key] = (expires_at, raw, {})
+            self._mem_bytes += len(raw)
+            self._mem_evict()
+
+    def _mem_evict(self) -> None:
+        # caller holds the lock
+        while self._mem and (
+            len(self._mem) > self.max_entries or self._mem_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._mem))
+            self._mem_pop(oldest)
+            self.counters["evictions"] += 1
+
+    def _mem_pop(self, key: str) -> None:
+        item = self._mem.pop(key, None)
+        if item is not None:
+            self._mem_bytes -= len(item[1]) + sum(map(len, item[2].values()))
+
+    # ---------------------------------------------------------------- database
+    def _db_get(self, key: str) -> Optional[Tuple[float, bytes]]:
+        now = time.time()
+        with Session(self.engine) as session:
+            row = session.get(LLMCacheEntry, key)
+            if row is None:
+                return None
+            if row.expires_at <= now:
+                session.delete(row)
+                session.commit()
+                return None
+            row.hits += 1
+            row.last_hit_at = now
+            session.add(row)
+            session.commit()
+            return row.expires_at, row.value.encode("utf-8")
+
+    def _db_put(self, key: str, raw: bytes, expires_at: float) -> None:
+        now = time.time()
+        with Session(self.engine) as session:
+            session.merge(
+                LLMCacheEntry(
+                    key=key,
+                    value=raw.decode("utf-8"),
+                    size=len(raw),
+                    created_at=now,
+                    expires_at=expires_at,
+                    last_hit_at=now,
+                )
+            )
+            session.commit()
+
+        # Amortize pruning: expired rows first, then least-recently-hit rows
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= 50:
+            self._writes_since_prune = 0
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop expired rows and trim the table to LLM_CACHE_DB_MAX_ROWS."""
+        if self.engine is None:
+            return 0
+        with Session(self.engine) as session:
+            removed = session.execute(
+                delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= time.time())
+            ).rowcount
+            total = session.exec(select(func.count()).select_from(LLMCacheEntry)).one()
+            overflow = total - self.db_max_rows
+            if overflow > 0:
+                stale = select(LLMCacheEntry.key).order_by(
+                    LLMCacheEntry.last_hit_at.asc()
+                ).limit(overflow)
+                removed += session.execute(
+                    delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(stale))
+                ).rowcount
+            session.commit()
+        self.counters["evictions"] += removed
+        return removed
+
+    def _mem_encoded(
+        self, key: str, encoding: str, encoder: Callable[[bytes, str], bytes]
+    ) -> Optional[bytes]:
+        with self._lock:
+            item = self._mem.get(key)
+        if item is None:
+            return None
+        raw, variants = item[1], item[2]
+        body = variants.get(encoding)
+        if body is not None:
+            self.counters["precompressed_hits"] += 1
+            return body
+        body = encoder(raw, encoding)
+        entry_bytes = len(raw) + sum(map(len, variants.values())) + len(body)
+        if entry_bytes > self.max_bytes:
+            return body  # the entry with this variant alone would exceed the budget
+        with self._lock:
+            if self._mem.get(key) is item and encoding not in variants:
+                variants[encoding] = body
+                self._mem_bytes += len(body)
+                self._mem.move_to_end(key)
+                self._mem_evict()
+        return body
+
+    # -------------------------------------------------------------------- API
+    async def _lookup(self, key: str) -> Optional[bytes]:
+        raw = self._mem_get(key)
+        if raw is not None:
+            self.counters["hits_memory"] += 1
+            return raw
+        if self.engine is not None:
+            found = await asyncio.to_thread(self._db_get, key)
+            if found is not None:
+                expires_at, raw = found
+                self._mem_put(key, raw, expires_at)
+                self.counters["hits_db"] += 1
+                return raw
+        self.counters["misses"] += 1
+        return None
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        raw = await self._lookup(key)
+        return None if raw is None else json.loads(raw)
+
+    async def get_encoded(
+        self, key: str, encoding: str, encoder: Callable[[bytes, str], bytes]
+    ) -> Optional[bytes]:
+        """
+        Cached JSON body already compressed with `encoding`. The first hit per
+        encoding runs `encoder(raw, encoding)`; later hits reuse its output.
+        """
+        if not self.enabled:
+            return None
+        raw = await self._lookup(key)
+        if raw is None:
+            return None
+        body = self._mem_encoded(key, encoding, encoder)
+        # Entries bigger than the memory budget never reach the LRU
+        return body if body is not None else encoder(raw, encoding)
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        raw = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        raw = raw.encode("utf-8")
+        expires_at = time.time() + self.ttl
+        self._mem_put(key, raw, expires_at)
+        if self.engine is not None:
+            await asyncio.to_thread(self._db_put, key, raw, expires_at)
+        self.counters["writes"] += 1
+
+    def note_bypass(self) -> None:
+        self.counters["bypassed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.counters["hits_memory"] + self.counters["hits_db"]
+        lookups = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._mem),
+            "memory_bytes": self._mem_bytes,
+        }
@@ -0,0 +1,66 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+BUDGET_ACTIONS = ("throttle", "cache", "mock")
+
+
+class TokenBudget:
+    """
+    Daily LLM token budget (per local day, per process).
+
+    Once `spent` reaches `daily_tokens`, `exceeded()` is true and callers
+    apply `action`:
+      throttle - keep calling the LLM, but from the scheduler's lowest lane
+      cache    - serve cached analyses, mock output on a miss
+      mock     - serve mock output without calling the LLM
+    The counter is seeded from the usage table at startup and reset when the
+    local day returned by `today()` changes.
+    """
+
+    def __init__(self, today: Callable[[], str]):
+        self.daily_tokens = int(os.getenv("LLM_DAILY_TOKEN_BUDGET", "0"))  # 0 = off
+        self.action = os.getenv("LLM_BUDGET_ACTION", "cache").lower()
+        if self.action not in BUDGET_ACTIONS:
+            raise ValueError(
+                f"LLM_BUDGET_ACTION must be one of {BUDGET_ACTIONS}: {self.action!r}"
+            )
+        self._today = today
+        self._day: Optional[str] = None
+        self.spent = 0
+        self.diverted = 0
+        self._lock = threading.Lock()
+
+    def _roll(self) -> None:
+        day = self._today()
+        if day != self._day:
+            self._day = day
+            self.spent = 0
+
+    def seed(self, day: str, tokens: int) -> None:
+        with self._lock:
+            self._day = day
+            self.spent = tokens
+
+    def add(self, tokens: int) -> None:
+        with self._lock:
+            self._roll()
+            self.spent += tokens
+
+    def exceeded(self) -> bool:
+        if not self.daily_tokens:
+            return False
+        with self._lock:
+            self._roll()
+            return self.spent >= self.daily_tokens
+
+    def note_diverted(self) -> None:
+        self.diverted += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "daily_tokens": self.daily_tokens,
+            "spent_today": self.spent,
+            "exceeded": self.exceeded(),
+            "diverted": self.diverted,
+        }
@@ -0,0 +1,149 @@
+"""
+Benchmark: the original keyword-chain classify_scenario versus the compiled
+keyword table in backend/agents/input_processor.py, on long inputs and on a
+backlog of short ideas. A combined-regex matcher is timed as a reference.
+
+    python scripts/bench_classifier.py [--words 2000 20000 200000] [--ideas 20000]
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+from typing import Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from backend.agents.input_processor import (  # noqa: E402
+    KEYWORDS,
+    classify_many,
+    classify_scenario,
+    labels_many,
+    scenario_labels,
+)
+
+
+def legacy_classify(text: str) -> str:
+    # classify_scenario before the keyword table
+    t = (text or "").lower()
+    if any(k in t for k in ["price", "pricing", "plan", "tier"]):
+        return "pricing_change"
+    if any(k in t for k in ["remove", "sunset", "deprecate"]):
+        return "feature_remove"
+    if any(k in t for k in ["add feature", "launch", "introduce", "premium tier"]):
+        return "feature_add"
+    if any(k in t for k in ["ux", "onboarding", "flow", "funnel"]):
+        return "ux_change"
+    if any(k in t for k in ["infra", "compute", "server", "cost"]):
+        return "ops_cost"
+    if any(k in t for k in ["gtm", "go-to-market", "release notes", "comms"]):
+        return "gtm_change"
+    return "other"
+
+
+# Reference: every keyword in one alternation, one finditer pass
+_LABEL_OF = {k: label for label, kws in KEYWORDS.items() for k in kws}
+_WEIGHT_OF = {k: w for kws in KEYWORDS.values() for k, w in kws.items()}
+_COMBINED = re.compile(
+    "(?=("
+    + "|".join(re.escape(k) for k in sorted(_LABEL_OF, key=len, reverse=True))
+    + "))"
+)
+
+
+def regex_labels(text: str) -> Dict[str, float]:
+    scores: Dict[str, float] = {}
+    for keyword in set(_COMBINED.findall(text.lower())):
+        label = _LABEL_OF[keyword]
+        scores[label] = scores.get(label, 0.0) + _WEIGHT_OF[keyword]
+    return scores
+
+
+def make_text(rng: random.Random, vocab: List[str], words: int, tail: str) -> str:
+    # Zipf-ish filler with the only real keyword at the very end (worst case
+    # for the early-exit chain)
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    return " ".join(rng.choices(vocab, weights, k=words)) + " " + tail
+
+
+def row(label: str, chars: int, timings: List[float]) -> str:
+    return f"{label:<16}{chars:>10}" + "".join(f"{ms:>11.3f}" for ms in timings)
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--words", type=int, nargs="+", default=[2000, 20000, 200000]
+    )
+    parser.add_argument("--ideas", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocab = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        for _ in range(5000)
+    ]
+    tails = ["we could sunset it", "ship release notes", "nothing to see"]
+
+    print(
+        f"{'input':<16}{'chars':>10}{'legacy ms':>11}{'table ms':>11}"
+        f"{'labels ms':>11}{'regex ms':>11}"
+    )
+    for words in args.words:
+        text = make_text(rng, vocab, words, tails[words % len(tails)])
+        assert classify_scenario(text) == legacy_classify(text)
+        timings = [
+            best_of(fn, args.repeat) * 1000
+            for fn in (
+                lambda: legacy_classify(text),
+                lambda: classify_scenario(text),
+                lambda: scenario_labels(text),
+                lambda: regex_labels(text),
+            )
+        ]
+        print(row(f"{words} words", len(text), timings))
+
+    # Backlog of short ideas, ~10% repeated verbatim
+    keywords = list(_LABEL_OF)
+    ideas = []
+    for _ in range(args.ideas):
+        if ideas and rng.random() < 0.1:
+            ideas.append(rng.choice(ideas))
+            continue
+        filler = rng.choices(vocab, k=rng.randint(8, 30))
+        if rng.random() < 0.7:
+            filler.insert(rng.randrange(len(filler)), rng.choice(keywords))
+        ideas.append(" ".join(filler))
+    assert classify_many(ideas) == [legacy_classify(t) for t in ideas]
+    timings = [
+        best_of(fn, args.repeat) * 1000
+        for fn in (
+            lambda: [legacy_classify(t) for t in ideas],
+            lambda: classify_many(ideas),
+            lambda: labels_many(ideas),
+            lambda: [regex_labels(t) for t in ideas],
+        )
+    ]
+    print(row(f"{args.ideas} ideas", sum(map(len, ideas)), timings))
+    print(
+        "\nlegacy/table = single label (first match in priority order);\n"
+        "labels = weighted multi-label (every keyword checked); "
+        "regex = combined alternation, multi-label"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark: response_model validation + stdlib JSON (old list path)
+versus FastJSONResponse on plain row dicts (current path).
+
+    python scripts/bench_serialization.py [--rows 1000 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+# Importing app must not touch the real database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app import TaskRead, TaskSummary, llm  # noqa: E402
+from backend.utils.fast_json import FastJSONResponse, orjson  # noqa: E402
+
+
+def make_rows(n: int, full: bool) -> List[dict]:
+    analysis = {"impact": 82, "aiRaw": llm.mock_json({"scenario": "bench"})}
+    start = datetime.now(timezone.utc)
+    rows = []
+    for i in range(n):
+        row = {
+            "id": i + 1,
+            "name": f"Scenario {i}",
+            "timeline": "3 months",
+            "impact_score": 82,
+            "created_at": start - timedelta(minutes=i),
+        }
+        if full:
+            row.update(
+                description="Benchmark scenario",
+                target_market="SMB",
+                resources=None,
+                assumptions=["budget fixed", "two engineers"],
+                ai_analysis=analysis,
+            )
+        rows.append(row)
+    return rows
+
+
+def old_path(adapter: TypeAdapter, rows: List[dict]) -> bytes:
+    # What FastAPI did with response_model + the default JSONResponse
+    validated = adapter.validate_python(rows)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def new_path(rows: List[dict]) -> bytes:
+    return FastJSONResponse(rows).body
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson else 'json (orjson not installed)'}")
+    print(f"{'shape':<10}{'rows':>8}{'old ms':>12}{'new ms':>12}{'speedup':>10}")
+    for shape, model, full in (
+        ("summary", TaskSummary, False),
+        ("full", TaskRead, True),
+    ):
+        adapter = TypeAdapter(List[model])
+        for n in args.rows:
+            rows = make_rows(n, full)
+            old = best_of(lambda: old_path(adapter, rows), args.repeat)
+            new = best_of(lambda: new_path(rows), args.repeat)
+            print(
+                f"{shape:<10}{n:>8}{old * 1000:>12.1f}{new * 1000:>12.1f}"
+                f"{old / new:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Input-token report for the lifecycle prompt variants (PROMPT_VARIANT).
+
+    python scripts/prompt_report.py [--scenario "text"] [--max-payload-tokens N]
+
+Counts with tiktoken's cl100k_base when it is installed (a close proxy for
+the Llama tokenizer), otherwise with the ~4 chars/token estimate.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from backend.prompts.compiler import (  # noqa: E402
+    PROMPT_VARIANTS,
+    compact_json,
+    estimate_tokens,
+    fit_payload,
+    prompts_for,
+)
+
+try:
+    import tiktoken
+
+    _enc = tiktoken.get_encoding("cl100k_base")
+
+    def count(text: str) -> int:
+        return len(_enc.encode(text))
+
+    COUNTER = "tiktoken cl100k_base"
+except ImportError:
+    count = estimate_tokens
+    COUNTER = "estimate (len/4; pip install tiktoken for real counts)"
+
+SAMPLE_PAYLOAD = {
+    "scenario": (
+        "Add an AI meeting summarizer to our project management app that "
+        "turns call recordings into action items assigned to the right people."
+    ),
+    "context": {
+        "name": "Meeting summarizer",
+        "targetMarket": "Remote product teams at 50-500 person SaaS companies",
+        "timeline": "1 quarter",
+        "resources": "2 engineers, 1 designer",
+        "assumptions": ["Calls are already recorded", "Teams use Slack"],
+    },
+}
+
+
+def common_prefix(texts) -> str:
+    return os.path.commonprefix(list(texts))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", help="Scenario text (default: a sample)")
+    parser.add_argument("--max-payload-tokens", type=int, default=0)
+    args = parser.parse_args()
+
+    payload = dict(SAMPLE_PAYLOAD)
+    if args.scenario:
+        payload["scenario"] = args.scenario
+
+    print(f"tokenizer: {COUNTER}\n")
+    print(
+        f"{'variant':<10}{'single':>9}{'sections':>10}{'shared':>9}"
+        f"{'per call':>10}  sha256"
+    )
+    for variant in PROMPT_VARIANTS:
+        single, sections = prompts_for(variant)
+        section_tokens = [count(p) for p in sections.values()]
+        shared = common_prefix([single, *sections.values()])
+        digest = hashlib.sha256(single.encode("utf-8")).hexdigest()[:12]
+        print(
+            f"{variant:<10}{count(single):>9}{sum(section_tokens):>10}"
+            f"{count(shared):>9}{max(section_tokens):>10}  {digest}"
+        )
+    print(
+        "\nsingle = system prompt for one completion; sections = sum over the "
+        "fan-out prompts;\nshared = prefix common to all prompts of the variant "
+        "(prompt-cache reuse);\nper call = largest fan-out prompt\n"
+    )
+
+    pretty = json.dumps(payload)
+    compact = compact_json(payload)
+    print(f"{'payload':<28}{'tokens':>8}")
+    print(f"{'json.dumps (old)':<28}{count(pretty):>8}")
+    print(f"{'compact separators':<28}{count(compact):>8}")
+    if args.max_payload_tokens:
+        fitted = compact_json(fit_payload(payload, args.max_payload_tokens))
+        label = f"fit to {args.max_payload_tokens} tokens"
+        print(f"{label:<28}{count(fitted):>8}")
+
+
+if __name__ == "__main__":
+    main()
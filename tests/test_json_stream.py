@@ -0,0 +1,51 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.json_stream import RowStreamParser  # noqa: E402
+
+
+def parse(body: str, chunk: int, max_row_chars: int = 50):
+    parser = RowStreamParser(max_row_chars=max_row_chars)
+    rows = []
+    for start in range(0, len(body), chunk):
+        rows += parser.feed(body[start : start + chunk])
+    return rows + parser.close()
+
+
+def test_ndjson_rows_and_bad_line():
+    rows = parse('{"a": 1}\n\nnot json\n{"b": 2}', chunk=4)
+    assert rows == [
+        (0, {"a": 1}, None),
+        (1, None, "invalid JSON: Expecting value"),
+        (2, {"b": 2}, None),
+    ]
+
+
+def test_array_split_across_chunks():
+    body = '[{"s": "x],y"}, {"n": 12345}]'
+    for chunk in (1, 3, len(body)):
+        assert parse(body, chunk) == [
+            (0, {"s": "x],y"}, None),
+            (1, {"n": 12345}, None),
+        ]
+
+
+def test_final_oversized_ndjson_line_without_newline():
+    body = '{"a": 1}\n{"b": "' + "x" * 80 + '"}'
+    rows = parse(body, chunk=len(body))
+    assert rows == [
+        (0, {"a": 1}, None),
+        (1, None, "row too large; import stopped"),
+    ]
+
+
+def test_chunks_after_stop_are_not_buffered():
+    parser = RowStreamParser(max_row_chars=50)
+    rows = parser.feed('{"a": 1}\n' + "x" * 80)
+    assert rows[-1] == (1, None, "row too large; import stopped")
+    for _ in range(1000):
+        assert parser.feed("y" * 10_000) == []
+    assert len(parser.text) <= 50
+    assert parser.close() == []